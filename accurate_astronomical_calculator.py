@@ -15,9 +15,54 @@ Key Improvements:
 
 import ephem
 import numpy as np
-from datetime import datetime, timedelta
+import pandas as pd
+from datetime import datetime, time
+import hashlib
+import json
 import math
+import os
 import pytz
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from eclipse_catalog import load_eclipse_catalog
+from astronomical_aspect_engine import AspectEngine
+from ephemeris_tables import ChebyshevEphemerisTable, EPHEMERIS_TABLE_FILE, load_ephemeris_table
+
+# Bump whenever a feature formula changes so cached feature stores are invalidated
+CALCULATOR_VERSION = '2.0'
+
+# PyEphem dates count days from 1899-12-31 12:00 UT (Dublin Julian Date)
+EPHEM_TO_JULIAN_DATE = 2415020
+EPHEM_EPOCH_DAY = np.datetime64('1899-12-31', 'D')
+J2000_JULIAN_DATE = 2451545.0
+
+CLASSICAL_BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars',
+                    'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+
+# Feature groups and the classical bodies each one needs an ephemeris call for.
+# Minor planets can also be requested per category as 'minor_planets:<category>'.
+FEATURE_GROUP_BODIES = {
+    'classical': CLASSICAL_BODIES,                # ecliptic longitudes
+    'lunar': ['moon'],                            # moon phase and distance
+    'houses': [],                                 # ascendant and midheaven
+    'nodes': [],                                  # mean lunar nodes
+    'retrograde': ['mercury'],                    # mercury_retrograde
+    'motion': CLASSICAL_BODIES,                   # <body>_speed and <body>_retrograde
+    'eclipse': [],                                # eclipse_proximity
+    'eclipse_detail': [],                         # days since/until solar and lunar eclipses
+    'aspects': CLASSICAL_BODIES,                  # conjunctions, oppositions, squares
+    'all_body_aspects': CLASSICAL_BODIES,         # aspect counts over classical + minor planets
+    'dignities': ['sun', 'moon', 'mercury'],      # simplified planetary dignities
+    'minor_planets': [],                          # all 92 minor planet longitudes
+}
+FEATURE_GROUPS = list(FEATURE_GROUP_BODIES)
+
+# The 116 individual features used by the study
+DEFAULT_FEATURE_GROUPS = ['classical', 'lunar', 'houses', 'nodes', 'retrograde', 'eclipse',
+                          'aspects', 'dignities', 'minor_planets']
+
+# "Core features only" ablation: no aspects and no dignities (110 features)
+CORE_FEATURE_GROUPS = ['classical', 'lunar', 'houses', 'nodes', 'retrograde', 'eclipse',
+                       'minor_planets']
 
 class AccurateAstronomicalCalculator:
     """
@@ -25,44 +70,75 @@ class AccurateAstronomicalCalculator:
     and all 97 minor planets/asteroids for comprehensive analysis.
     """
     
-    def __init__(self):
+    def __init__(self, aspects=None, feature_groups=None, latitude='41.8781', longitude='-87.6298',
+                 elevation=182, observation_time=time(12, 0), ephemeris_table=None):
+        self.eclipse_catalog = load_eclipse_catalog()
         self.eclipse_dates = self._load_eclipse_dates()
+        self.eclipse_index = self._build_eclipse_index()
         self.chicago_tz = pytz.timezone('America/Chicago')
         self.minor_planets = self._define_all_minor_planets()
+        self.minor_planet_table = self._build_minor_planet_table()
+        # Aspect name -> (angle, orb); defaults to conjunction/opposition/square with 8 degree orbs
+        self.aspect_engine = AspectEngine(aspects)
+        # Feature groups computed by default (see FEATURE_GROUPS)
+        self.feature_groups = list(feature_groups if feature_groups is not None else DEFAULT_FEATURE_GROUPS)
+        self._resolve_feature_groups()
+        
+        # Observer configuration (also part of the feature store cache key)
+        self.latitude = latitude  # Chicago latitude
+        self.longitude = longitude  # Chicago longitude
+        self.elevation = elevation  # Chicago elevation in meters
+        self.observation_time = observation_time  # Local observation time (noon by default)
+        
+        # Optional Chebyshev tables for the outer bodies: True uses the cached 1990-2040
+        # table (built on first use), or pass a .npz path or a ChebyshevEphemerisTable
+        self.ephemeris_table = None
+        if isinstance(ephemeris_table, ChebyshevEphemerisTable):
+            self.ephemeris_table = ephemeris_table
+        elif ephemeris_table:
+            path = EPHEMERIS_TABLE_FILE if ephemeris_table is True else ephemeris_table
+            self.ephemeris_table = load_ephemeris_table(self, path)
+        
         print("🌌 Accurate Astronomical Calculator initialized")
         print("✓ Using proper ecliptic coordinate system")
-        print("✓ Standardized to noon Chicago local time")
+        print(f"✓ Standardized to {self.observation_time.strftime('%H:%M')} Chicago local time")
         print(f"✓ Including {sum(len(category) for category in self.minor_planets.values())} minor planets/asteroids")
     
-    def _equatorial_to_ecliptic_longitude(self, ra, dec, observer):
+    def feature_names(self, groups=None):
         """
-        Convert equatorial coordinates (RA, Dec) to ecliptic longitude.
-        
-        This is the proper way to get astronomical longitude from PyEphem data.
+        Names of the features produced by calculate_features, in output order.
         """
-        # Get the obliquity of the ecliptic for the observation date
-        # Using J2000.0 obliquity with correction for date
-        jd = float(observer.date) + 2415020  # Convert PyEphem date to Julian Date
-        t = (jd - 2451545.0) / 36525.0  # Centuries since J2000.0
-        
-        # Mean obliquity of the ecliptic
-        epsilon = 23.43929111 - 0.013004167 * t - 0.00000164 * t**2 + 0.00000504 * t**3
-        epsilon_rad = math.radians(epsilon)
-        
-        # Convert RA and Dec to radians
-        ra_rad = float(ra)
-        dec_rad = float(dec)
-        
-        # Calculate ecliptic longitude
-        sin_lambda = (math.sin(ra_rad) * math.cos(epsilon_rad) + 
-                     math.tan(dec_rad) * math.sin(epsilon_rad))
-        cos_lambda = math.cos(ra_rad)
-        
-        lambda_rad = math.atan2(sin_lambda, cos_lambda)
-        lambda_deg = math.degrees(lambda_rad)
+        return list(self.calculate_features_batch([], as_frame=False, groups=groups))
+    
+    def cache_key(self):
+        """
+        Everything a cached feature value depends on besides the date itself:
+        observer location, local observation time and a hash of the feature definitions.
+        """
+        definition = {
+            'calculator_version': CALCULATOR_VERSION,
+            'features': self.feature_names(),
+            'minor_planets': {name: [float(self.minor_planet_table[field][k]) for field in
+                                     ('mean_daily_motion', 'epoch_offset', 'eccentricity', 'inclination')]
+                              for k, name in enumerate(self.minor_planet_table['feature_names'])},
+            'eclipse_dates': [eclipse.strftime('%Y-%m-%d') for eclipse in self.eclipse_dates],
+            'aspects': self.aspect_engine.aspects,
+            'feature_groups': self.feature_groups,
+            # UTC offset rule: the offset in force at the local observation time
+            'observation_offset': 'observation_time',
+        }
+        if self.ephemeris_table is not None:
+            definition['ephemeris_table'] = self.ephemeris_table.fingerprint()
+        definition_hash = hashlib.sha256(json.dumps(definition, sort_keys=True).encode()).hexdigest()
         
-        # Ensure longitude is in 0-360 range
-        return lambda_deg % 360
+        return {
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'elevation': self.elevation,
+            'observation_time': self.observation_time.strftime('%H:%M:%S'),
+            'timezone': self.chicago_tz.zone,
+            'feature_definition_hash': definition_hash,
+        }
     
     def _define_all_minor_planets(self):
         """
@@ -226,21 +302,13 @@ class AccurateAstronomicalCalculator:
             }
         }
     
-    def _calculate_minor_planet_longitude(self, planet_info, observer):
-        """
-        Calculate accurate longitude for minor planets using improved orbital mechanics.
+    def _minor_planet_orbital_constants(self, planet_number):
         """
-        planet_name = planet_info['name']
-        planet_number = planet_info['number']
-        
-        # Get Julian Date
-        jd = float(observer.date) + 2415020  # Convert PyEphem date to Julian Date
-        t = (jd - 2451545.0) / 36525.0  # Centuries since J2000.0
+        Derive the approximate orbital constants for one minor planet from its number.
         
-        # Improved orbital calculations based on planet type and number
-        # This is still an approximation but much more realistic than hash-based
-        
-        # Determine orbital characteristics based on planet number and type
+        This is still an approximation but much more realistic than hash-based.
+        Returns (mean_daily_motion, epoch_offset, eccentricity, inclination).
+        """
         planet_num = int(planet_number)
         
         # Assign orbital periods based on asteroid belt regions and special cases
@@ -270,56 +338,98 @@ class AccurateAstronomicalCalculator:
         if planet_number in special_periods:
             period_years = special_periods[planet_number]
         
-        # Calculate mean longitude
         mean_daily_motion = 360.0 / (period_years * 365.25)
         
-        # Add epoch offset based on planet characteristics
+        # Epoch offset based on planet characteristics
         epoch_offset = (planet_num * 137.5) % 360  # Use golden angle for distribution
         
-        # Calculate mean longitude at epoch
-        days_since_epoch = (jd - 2451545.0)  # Days since J2000.0
-        mean_longitude = (epoch_offset + mean_daily_motion * days_since_epoch) % 360
-        
-        # Add orbital eccentricity effects
+        # Orbital eccentricity
         eccentricity = 0.05 + (planet_num % 50) * 0.004  # 0.05 to 0.25
         if eccentricity > 0.25:
             eccentricity = 0.25
         
+        # Inclination
+        inclination = (planet_num % 25) * 0.5  # 0 to 12.5 degrees
+        
+        return mean_daily_motion, epoch_offset, eccentricity, inclination
+    
+    def _build_minor_planet_table(self):
+        """
+        Precompute the per-body orbital constants of all minor planets once, as a
+        struct of arrays in feature order (category, then planet).
+        """
+        feature_names = []
+        categories = []
+        constants = []
+        for category_name, category_planets in self.minor_planets.items():
+            for planet_key, planet_info in category_planets.items():
+                feature_names.append(f"{category_name}_{planet_key}_longitude")
+                categories.append(category_name)
+                constants.append(self._minor_planet_orbital_constants(planet_info['number']))
+        
+        constants = np.array(constants, dtype=float).reshape(-1, 4)
+        return {
+            'feature_names': feature_names,
+            'categories': categories,
+            'mean_daily_motion': constants[:, 0],
+            'epoch_offset': constants[:, 1],
+            'eccentricity': constants[:, 2],
+            'inclination': constants[:, 3],
+        }
+    
+    def _calculate_minor_planet_longitudes(self, ephem_dates, columns=None):
+        """
+        Calculate the longitudes of minor planets for an array of PyEphem dates
+        using the improved orbital mechanics approximation.
+        
+        Returns a (dates, bodies) array whose columns follow
+        self.minor_planet_table['feature_names'], or only the given column indices.
+        """
+        table = self.minor_planet_table
+        if columns is not None:
+            table = {field: table[field][columns] for field in
+                     ('mean_daily_motion', 'epoch_offset', 'eccentricity', 'inclination')}
+        jd = np.asarray(ephem_dates, dtype=float)[:, None] + EPHEM_TO_JULIAN_DATE
+        
+        # Calculate mean longitude at epoch
+        days_since_epoch = (jd - J2000_JULIAN_DATE)  # Days since J2000.0
+        mean_longitude = (table['epoch_offset'] + table['mean_daily_motion'] * days_since_epoch) % 360
+        
         # Eccentric anomaly correction (simplified)
-        ecc_correction = eccentricity * 20 * math.sin(math.radians(mean_longitude * 2))
+        ecc_correction = table['eccentricity'] * 20 * np.sin(np.radians(mean_longitude * 2))
         
         # Add inclination effects
-        inclination = (planet_num % 25) * 0.5  # 0 to 12.5 degrees
-        inc_correction = inclination * 0.3 * math.cos(math.radians(mean_longitude * 1.5))
+        inc_correction = table['inclination'] * 0.3 * np.cos(np.radians(mean_longitude * 1.5))
         
         # Add perturbations from Jupiter (simplified)
         jupiter_mean_longitude = (100.4 + 0.985 * days_since_epoch) % 360  # Approximate Jupiter position
-        jupiter_effect = 0.5 * math.sin(math.radians(mean_longitude - jupiter_mean_longitude))
+        jupiter_effect = 0.5 * np.sin(np.radians(mean_longitude - jupiter_mean_longitude))
         
         # Final longitude calculation
-        longitude = (mean_longitude + ecc_correction + inc_correction + jupiter_effect) % 360
-        
-        return longitude
+        return (mean_longitude + ecc_correction + inc_correction + jupiter_effect) % 360
+    
+    def _configured_observer(self):
+        """
+        Create an observer for the configured location; callers only set .date.
+        """
+        observer = ephem.Observer()
+        observer.lat = self.latitude
+        observer.lon = self.longitude
+        observer.elevation = self.elevation
+        return observer
     
     def _create_observer(self, dt):
         """
         Create a properly configured observer for Chicago at noon local time.
         """
-        observer = ephem.Observer()
-        observer.lat = '41.8781'  # Chicago latitude
-        observer.lon = '-87.6298'  # Chicago longitude
-        observer.elevation = 182  # Chicago elevation in meters
-        
-        # Convert input datetime to Chicago timezone if it's naive
-        if dt.tzinfo is None:
-            # Assume input is already in Chicago local time
-            chicago_dt = self.chicago_tz.localize(dt)
-        else:
-            # Convert to Chicago time
-            chicago_dt = dt.astimezone(self.chicago_tz)
+        observer = self._configured_observer()
         
-        # Set to noon Chicago local time for consistency
-        noon_chicago = chicago_dt.replace(hour=12, minute=0, second=0, microsecond=0)
+        # Naive input is already Chicago local time; aware input is converted to it
+        chicago_date = dt.date() if dt.tzinfo is None else dt.astimezone(self.chicago_tz).date()
+        
+        # Localize noon Chicago local time itself, so the UTC offset is the one in
+        # force at noon (not at midnight) on DST transition days
+        noon_chicago = self.chicago_tz.localize(datetime.combine(chicago_date, self.observation_time))
         
         # Convert to UTC for PyEphem (which expects UTC)
         noon_utc = noon_chicago.astimezone(pytz.UTC)
@@ -327,50 +437,194 @@ class AccurateAstronomicalCalculator:
         
         return observer
     
-    def _calculate_planetary_longitude(self, planet_obj, observer):
+    def _load_eclipse_dates(self):
+        """Load solar eclipse dates (1990-2040) from the cached eclipse catalog."""
+        return [eclipse_date for eclipse_date, eclipse_type in self.eclipse_catalog if eclipse_type == 'solar']
+    
+    def _build_eclipse_index(self):
+        """
+        Sorted eclipse day numbers (days since 1970-01-01) per eclipse type.
+        """
+        return {
+            eclipse_type: np.sort(np.array([eclipse_date for eclipse_date, kind in self.eclipse_catalog
+                                            if kind == eclipse_type],
+                                           dtype='datetime64[D]').astype(np.int64))
+            for eclipse_type in ('solar', 'lunar')
+        }
+    
+    def _resolve_feature_groups(self, groups=None):
+        """
+        Validate a feature group specification.
+        
+        Returns (set of groups, list of selected minor planet categories). Minor planets
+        are requested either all at once ('minor_planets') or per category
+        ('minor_planets:<category>').
+        """
+        groups = self.feature_groups if groups is None else list(groups)
+        
+        resolved = set()
+        minor_categories = []
+        for group in groups:
+            if group == 'minor_planets':
+                minor_categories.extend(self.minor_planets)
+            elif group.startswith('minor_planets:') and group.split(':', 1)[1] in self.minor_planets:
+                minor_categories.append(group.split(':', 1)[1])
+            elif group in FEATURE_GROUP_BODIES:
+                resolved.add(group)
+            else:
+                raise ValueError(f"Unknown feature group '{group}'. Valid groups: {FEATURE_GROUPS} "
+                                 f"or 'minor_planets:<category>' for {list(self.minor_planets)}")
+        
+        if minor_categories:
+            resolved.add('minor_planets')
+        # Keep catalog order regardless of the order categories were requested in
+        minor_categories = [category for category in self.minor_planets if category in minor_categories]
+        
+        return resolved, minor_categories
+    
+    def calculate_features(self, dt, groups=None):
+        """
+        Calculate accurate astronomical features for the given datetime.
+        All positions calculated as ecliptic longitudes at noon Chicago local time.
+        
+        groups selects feature groups (see FEATURE_GROUPS); by default the
+        calculator's feature_groups are used.
+        """
+        observer = self._create_observer(dt)
+        chicago_dt = dt.astimezone(self.chicago_tz) if dt.tzinfo is not None else dt
+        
+        columns = self._calculate_feature_columns(pd.DatetimeIndex([chicago_dt.date()]),
+                                                  np.array([float(observer.date)]), groups)
+        
+        return {name: values[0].item() for name, values in columns.items()}
+    
+    def _normalize_batch_dates(self, start, end=None):
+        """
+        Normalize a date range or an iterable of dates to naive Chicago-local dates.
+        """
+        if end is not None:
+            dates = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+        else:
+            dates = pd.DatetimeIndex(start if isinstance(start, (pd.Index, pd.Series, np.ndarray)) else list(start))
+        
+        if dates.tz is not None:
+            # Same convention as calculate_features: aware inputs are moved to Chicago time
+            dates = dates.tz_convert(self.chicago_tz).tz_localize(None)
+        
+        return dates.normalize()
+    
+    def observation_times_utc(self, local_times, offset_at_observation_time=True):
+        """
+        Convert naive Chicago-local dates/times to the UTC instants of the local
+        observation time on those dates, in one vectorized, DST-aware step.
+        
+        The UTC offset in effect at the observation time itself is used, the rule of
+        _create_observer (noon on 2021-03-14 is 17:00 UTC); with
+        offset_at_observation_time=False it is the offset at the input local time
+        (midnight for plain dates). Ambiguous and non-existent local times resolve
+        like pytz localize() does by default, i.e. as standard time.
+        """
+        local_times = pd.DatetimeIndex(local_times)
+        observation_offset = pd.Timedelta(hours=self.observation_time.hour,
+                                          minutes=self.observation_time.minute,
+                                          seconds=self.observation_time.second)
+        local_observation = local_times.normalize() + observation_offset
+        reference = local_observation if offset_at_observation_time else local_times
+        
+        localized = reference.tz_localize(self.chicago_tz,
+                                          ambiguous=np.zeros(len(reference), dtype=bool),
+                                          nonexistent=pd.Timedelta(hours=1))
+        utc_offset = localized.tz_convert('UTC').tz_localize(None) - reference
+        
+        return local_observation + utc_offset
+    
+    def local_times_utc(self, local_times):
+        """
+        Convert naive Chicago-local instants (e.g. an hourly grid) to naive UTC, with the
+        same DST rules as observation_times_utc: ambiguous and non-existent local times
+        resolve as standard time.
+        """
+        local_times = pd.DatetimeIndex(local_times)
+        localized = local_times.tz_localize(self.chicago_tz,
+                                            ambiguous=np.zeros(len(local_times), dtype=bool),
+                                            nonexistent=pd.Timedelta(hours=1))
+        return local_times + (localized.tz_convert('UTC').tz_localize(None) - local_times)
+    
+    def _to_ephem_dates(self, utc_times):
         """
-        Calculate accurate ecliptic longitude for a planetary object.
+        Convert naive UTC times to PyEphem dates (float days since 1899-12-31 12:00 UT).
+        
+        The day fraction is accumulated in the same order PyEphem uses for datetime
+        objects, so results are bit-identical to float(ephem.Date(dt)).
+        """
+        utc_times = pd.DatetimeIndex(utc_times)
+        days = (utc_times.normalize().values.astype('datetime64[D]') - EPHEM_EPOCH_DAY).astype(np.int64)
+        
+        ephem_dates = days - 0.5
+        ephem_dates = ephem_dates + utc_times.hour.values / 24.0
+        ephem_dates = ephem_dates + utc_times.minute.values / 24.0 / 60.0
+        ephem_dates = ephem_dates + utc_times.second.values / 24.0 / 60.0 / 60.0
+        ephem_dates = ephem_dates + utc_times.microsecond.values / 24.0 / 60.0 / 60.0 / 1e6
+        return ephem_dates
+    
+    def _julian_centuries(self, ephem_dates):
+        """
+        Julian centuries since J2000.0 for an array of PyEphem dates.
+        """
+        jd = np.asarray(ephem_dates, dtype=float) + EPHEM_TO_JULIAN_DATE  # Convert PyEphem date to Julian Date
+        return (jd - J2000_JULIAN_DATE) / 36525.0
+    
+    def _equatorial_to_ecliptic_longitudes(self, ra, dec, t):
+        """
+        Convert equatorial coordinates (RA, Dec) to ecliptic longitude.
+        
+        This is the proper way to get astronomical longitude from PyEphem data.
+        ra/dec are radians with shape (dates, bodies); t is Julian centuries with shape (dates,).
         """
-        planet_obj.compute(observer)
-        return self._equatorial_to_ecliptic_longitude(planet_obj.ra, planet_obj.dec, observer)
+        # Mean obliquity of the ecliptic (J2000.0 obliquity with correction for date)
+        t = np.asarray(t, dtype=float)[:, None]
+        epsilon = 23.43929111 - 0.013004167 * t - 0.00000164 * t**2 + 0.00000504 * t**3
+        epsilon_rad = np.radians(epsilon)
+        
+        # Calculate ecliptic longitude
+        sin_lambda = np.sin(ra) * np.cos(epsilon_rad) + np.tan(dec) * np.sin(epsilon_rad)
+        cos_lambda = np.cos(ra)
+        
+        # Ensure longitude is in 0-360 range
+        return np.degrees(np.arctan2(sin_lambda, cos_lambda)) % 360
     
-    def _calculate_house_positions(self, observer):
+    def _calculate_house_positions_batch(self, sidereal_times, latitude, t):
         """
         Calculate accurate astrological house positions.
+        
+        latitude is float(observer.lat) and goes through math.radians as it always
+        has, so values stay identical to earlier feature sets.
         """
         # Local Sidereal Time at observer location
-        lst = float(observer.sidereal_time()) * 12 / math.pi  # Convert to hours
-        
-        # Calculate Ascendant (1st house cusp)
-        lat_rad = math.radians(float(observer.lat))
+        lst = np.asarray(sidereal_times, dtype=float) * 12 / math.pi  # Convert to hours
+        lat_rad = math.radians(latitude)
         
         # Mean obliquity for current date
-        jd = float(observer.date) + 2415020
-        t = (jd - 2451545.0) / 36525.0
         epsilon = 23.43929111 - 0.013004167 * t
-        epsilon_rad = math.radians(epsilon)
+        epsilon_rad = np.radians(epsilon)
         
-        # Calculate ascendant
-        lst_rad = math.radians(lst * 15)  # Convert hours to degrees to radians
-        ascendant_rad = math.atan2(math.cos(lst_rad), 
-                                  -(math.sin(lst_rad) * math.cos(epsilon_rad) + 
-                                    math.tan(lat_rad) * math.sin(epsilon_rad)))
+        # Calculate ascendant (1st house cusp)
+        lst_rad = np.radians(lst * 15)  # Convert hours to degrees to radians
+        ascendant_rad = np.arctan2(np.cos(lst_rad),
+                                   -(np.sin(lst_rad) * np.cos(epsilon_rad) +
+                                     math.tan(lat_rad) * np.sin(epsilon_rad)))
         
-        ascendant = math.degrees(ascendant_rad) % 360
+        ascendant = np.degrees(ascendant_rad) % 360
         
         # Midheaven (10th house cusp) - simplified calculation
         midheaven = (lst * 15) % 360
         
         return ascendant, midheaven
     
-    def _calculate_lunar_nodes(self, observer):
+    def _calculate_lunar_nodes_batch(self, t):
         """
-        Calculate accurate lunar node positions.
+        Calculate accurate lunar node positions (mean node).
         """
-        # Mean lunar node calculation
-        jd = float(observer.date) + 2415020
-        t = (jd - 2451545.0) / 36525.0
-        
         # Mean longitude of ascending node
         omega = 125.04452 - 1934.136261 * t + 0.0020708 * t**2 + t**3 / 450000.0
         north_node = omega % 360
@@ -378,166 +632,357 @@ class AccurateAstronomicalCalculator:
         
         return north_node, south_node
     
-    def _load_eclipse_dates(self):
-        """Load eclipse dates for 2001-2025."""
-        eclipse_dates = [
-            # Solar Eclipses
-            '2001-06-21', '2001-12-14', '2002-06-10', '2002-12-04', '2003-05-31',
-            '2003-11-23', '2004-04-19', '2004-10-14', '2005-04-08', '2005-10-03',
-            '2006-03-29', '2006-09-22', '2007-03-19', '2007-09-11', '2008-02-07',
-            '2008-08-01', '2009-01-26', '2009-07-22', '2010-01-15', '2010-07-11',
-            '2011-01-04', '2011-06-01', '2011-07-01', '2011-11-25', '2012-05-20',
-            '2012-11-13', '2013-05-10', '2013-11-03', '2014-04-29', '2014-10-23',
-            '2015-03-20', '2015-09-13', '2016-03-09', '2016-09-01', '2017-02-26',
-            '2017-08-21', '2018-02-15', '2018-07-13', '2018-08-11', '2019-01-06',
-            '2019-07-02', '2019-12-26', '2020-06-21', '2020-12-14', '2021-06-10',
-            '2021-12-04', '2022-04-30', '2022-10-25', '2023-04-20', '2023-10-14',
-            '2024-04-08', '2024-10-02', '2025-03-29', '2025-09-21'
-        ]
-        return [datetime.strptime(date, '%Y-%m-%d') for date in eclipse_dates]
-    
-    def calculate_features(self, dt):
+    def _eclipse_offsets_batch(self, dates, eclipse_type='solar'):
         """
-        Calculate accurate astronomical features for the given datetime.
-        All positions calculated as ecliptic longitudes at noon Chicago local time.
+        Days since the previous and until the next eclipse of one type for every date,
+        from a single binary-search pass over the sorted eclipse index.
         """
-        observer = self._create_observer(dt)
-        features = {}
-        
-        # Create planetary objects
-        sun = ephem.Sun()
-        moon = ephem.Moon()
-        mercury = ephem.Mercury()
-        venus = ephem.Venus()
-        mars = ephem.Mars()
-        jupiter = ephem.Jupiter()
-        saturn = ephem.Saturn()
-        uranus = ephem.Uranus()
-        neptune = ephem.Neptune()
-        pluto = ephem.Pluto()
+        eclipse_days = self.eclipse_index[eclipse_type]
+        date_days = dates.values.astype('datetime64[D]').astype(np.int64)
+        
+        next_position = np.searchsorted(eclipse_days, date_days, side='left')
+        if len(date_days) and (next_position.min() == 0 or next_position.max() == len(eclipse_days)):
+            raise ValueError(f"Dates {dates.min().date()} to {dates.max().date()} fall outside the "
+                             f"{eclipse_type} eclipse catalog; regenerate it with eclipse_catalog.py")
+        
+        # An eclipse on the date itself counts as both 0 days since and 0 days until
+        days_until = eclipse_days[np.minimum(next_position, len(eclipse_days) - 1)] - date_days
+        on_eclipse = days_until == 0
+        days_since = np.where(on_eclipse, 0, date_days - eclipse_days[np.maximum(next_position - 1, 0)])
+        
+        return days_since, days_until
+    
+    def _sweep_positions(self, instants, body_names):
+        """
+        Compute the requested classical bodies once per instant (PyEphem dates) with a
+        single reused observer. Excluded bodies cost no ephemeris calls, and bodies in the
+        ephemeris table (when enabled and covering every instant) are evaluated from it.
+        
+        Returns a dict with (instants, bodies) ecliptic longitudes in body_names order and
+        per-instant sidereal time, moon phase and moon distance (NaN without the moon).
+        """
+        observer = self._configured_observer()
+        
+        table = self.ephemeris_table
+        table_names = ([name for name in body_names if name in table.bodies]
+                       if table is not None and table.covers(instants) else [])
+        ephem_names = [name for name in body_names if name not in table_names]
+        
+        bodies = [getattr(ephem, name.capitalize())() for name in ephem_names]
+        moon = bodies[ephem_names.index('moon')] if 'moon' in ephem_names else None
+        
+        n_instants = len(instants)
+        ra = np.empty((n_instants, len(bodies)))
+        dec = np.empty((n_instants, len(bodies)))
+        sidereal_times = np.empty(n_instants)
+        moon_phase = np.full(n_instants, np.nan)
+        moon_distance = np.full(n_instants, np.nan)
+        
+        for i, instant in enumerate(instants):
+            observer.date = instant
+            sidereal_times[i] = float(observer.sidereal_time())
+            
+            for j, body in enumerate(bodies):
+                body.compute(observer)
+                ra[i, j] = float(body.ra)
+                dec[i, j] = float(body.dec)
+            
+            if moon is not None:
+                moon_phase[i] = moon.moon_phase
+                moon_distance[i] = float(moon.earth_distance) * 149597870.7  # Convert to km
+        
+        longitudes = np.empty((n_instants, len(body_names)))
+        longitudes[:, [body_names.index(name) for name in ephem_names]] = \
+            self._equatorial_to_ecliptic_longitudes(ra, dec, self._julian_centuries(instants))
+        if table_names:
+            longitudes[:, [body_names.index(name) for name in table_names]] = \
+                table.longitudes(instants, table_names)
+        
+        return {
+            'longitudes': longitudes,
+            'sidereal_times': sidereal_times,
+            'moon_phase': moon_phase,
+            'moon_distance': moon_distance,
+            'latitude': float(observer.lat),
+        }
+    
+    def _daily_motion(self, current_longitudes, next_longitudes):
+        """
+        Degrees per day between consecutive daily positions, wrapped to [-180, 180].
+        """
+        speed = next_longitudes - current_longitudes
+        speed = np.where(speed > 180, speed - 360, speed)
+        return np.where(speed < -180, speed + 360, speed)
+    
+    def _calculate_feature_columns(self, dates, ephem_dates, groups=None, next_ephem_dates=None):
+        """
+        Calculate the requested feature groups for Chicago-local dates observed at the
+        given PyEphem instants. Returns a dict of feature name -> NumPy array.
+        
+        Daily motion compares each instant with next_ephem_dates, by default the next
+        day's local observation time.
+        """
+        groups, minor_categories = self._resolve_feature_groups(groups)
+        body_names = [name for name in CLASSICAL_BODIES
+                      if any(name in FEATURE_GROUP_BODIES[group] for group in groups)]
+        needs_motion = bool(groups & {'retrograde', 'motion'})
+        
+        # Observation instants for each date and, for daily motion, for the next day
+        # at the same local observation time
+        if needs_motion:
+            if next_ephem_dates is None:
+                next_ephem_dates = self._to_ephem_dates(self.observation_times_utc(dates + pd.Timedelta(days=1)))
+        else:
+            next_ephem_dates = np.empty(0)
+        
+        # Contiguous ranges share almost every instant between "today" and "tomorrow"
+        instants, inverse = np.unique(np.concatenate([ephem_dates, next_ephem_dates]),
+                                      return_inverse=True)
+        current_idx = inverse[:len(dates)]
+        next_idx = inverse[len(dates):]
+        
+        sweep = self._sweep_positions(instants, body_names)
+        longitudes = sweep['longitudes'][current_idx]
+        body_longitude = {name: longitudes[:, j] for j, name in enumerate(body_names)}
+        speeds = self._daily_motion(longitudes, sweep['longitudes'][next_idx]) if needs_motion else None
+        t = self._julian_centuries(ephem_dates)
+        
+        minor_columns = [k for k, category in enumerate(self.minor_planet_table['categories'])
+                         if category in minor_categories]
+        if 'all_body_aspects' in groups:
+            # All-body aspects always include every minor planet
+            minor_longitudes = self._calculate_minor_planet_longitudes(ephem_dates)
+            selected_minor_longitudes = minor_longitudes[:, minor_columns]
+        elif minor_columns:
+            selected_minor_longitudes = self._calculate_minor_planet_longitudes(ephem_dates, minor_columns)
+        
+        columns = {}
         
         # Calculate accurate ecliptic longitudes
-        features.update({
-            'sun_longitude': self._calculate_planetary_longitude(sun, observer),
-            'moon_longitude': self._calculate_planetary_longitude(moon, observer),
-            'mercury_longitude': self._calculate_planetary_longitude(mercury, observer),
-            'venus_longitude': self._calculate_planetary_longitude(venus, observer),
-            'mars_longitude': self._calculate_planetary_longitude(mars, observer),
-            'jupiter_longitude': self._calculate_planetary_longitude(jupiter, observer),
-            'saturn_longitude': self._calculate_planetary_longitude(saturn, observer),
-            'uranus_longitude': self._calculate_planetary_longitude(uranus, observer),
-            'neptune_longitude': self._calculate_planetary_longitude(neptune, observer),
-            'pluto_longitude': self._calculate_planetary_longitude(pluto, observer),
-        })
+        if 'classical' in groups:
+            for name in CLASSICAL_BODIES:
+                columns[f'{name}_longitude'] = body_longitude[name]
         
         # Calculate lunar properties
-        moon.compute(observer)
-        features.update({
-            'moon_phase': moon.moon_phase,
-            'moon_distance': float(moon.earth_distance) * 149597870.7,  # Convert to km
-        })
+        if 'lunar' in groups:
+            columns['moon_phase'] = sweep['moon_phase'][current_idx]
+            columns['moon_distance'] = sweep['moon_distance'][current_idx]
         
         # Calculate house positions
-        ascendant, midheaven = self._calculate_house_positions(observer)
-        features.update({
-            'ascendant': ascendant,
-            'midheaven': midheaven,
-        })
+        if 'houses' in groups:
+            columns['ascendant'], columns['midheaven'] = self._calculate_house_positions_batch(
+                sweep['sidereal_times'][current_idx], sweep['latitude'], t)
         
         # Calculate lunar nodes
-        north_node, south_node = self._calculate_lunar_nodes(observer)
-        features.update({
-            'north_node': north_node,
-            'south_node': south_node,
-        })
+        if 'nodes' in groups:
+            columns['north_node'], columns['south_node'] = self._calculate_lunar_nodes_batch(t)
         
         # Mercury retrograde calculation
-        mercury_speed = self._calculate_planet_speed(mercury, observer)
-        features['mercury_retrograde'] = 1 if mercury_speed < 0 else 0
+        if 'retrograde' in groups:
+            columns['mercury_retrograde'] = (speeds[:, body_names.index('mercury')] < 0).astype(np.int64)
         
-        # Eclipse proximity (days to nearest eclipse)
-        eclipse_proximity = min(abs((dt.date() - eclipse.date()).days) 
-                               for eclipse in self.eclipse_dates)
-        features['eclipse_proximity'] = eclipse_proximity
+        # Eclipse proximity (days to nearest solar eclipse)
+        if groups & {'eclipse', 'eclipse_detail'}:
+            days_since_eclipse, days_until_eclipse = self._eclipse_offsets_batch(dates, 'solar')
+        if 'eclipse' in groups:
+            columns['eclipse_proximity'] = np.minimum(days_since_eclipse, days_until_eclipse)
         
         # Calculate planetary aspects (conjunctions, oppositions, squares)
-        planetary_longitudes = [
-            features['sun_longitude'], features['moon_longitude'], 
-            features['mercury_longitude'], features['venus_longitude'],
-            features['mars_longitude'], features['jupiter_longitude'],
-            features['saturn_longitude'], features['uranus_longitude'],
-            features['neptune_longitude'], features['pluto_longitude']
-        ]
-        
-        # Count major aspects
-        conjunctions = 0
-        oppositions = 0
-        squares = 0
-        
-        for i in range(len(planetary_longitudes)):
-            for j in range(i + 1, len(planetary_longitudes)):
-                diff = abs(planetary_longitudes[i] - planetary_longitudes[j])
-                diff = min(diff, 360 - diff)  # Handle wrap-around
-                
-                if diff <= 8:  # Conjunction (within 8 degrees)
-                    conjunctions += 1
-                elif abs(diff - 180) <= 8:  # Opposition (within 8 degrees of 180)
-                    oppositions += 1
-                elif abs(diff - 90) <= 8 or abs(diff - 270) <= 8:  # Square (within 8 degrees of 90/270)
-                    squares += 1
-        
-        features.update({
-            'conjunctions': conjunctions,
-            'oppositions': oppositions,
-            'squares': squares,
-        })
+        classical_longitudes = (np.column_stack([body_longitude[name] for name in CLASSICAL_BODIES])
+                                if groups & {'aspects', 'all_body_aspects'} else None)
+        if 'aspects' in groups:
+            columns.update(self.aspect_engine.count_aspects(classical_longitudes))
         
         # Planetary dignities (simplified)
-        features.update({
-            'sun_dignity': 1 if 120 <= features['sun_longitude'] <= 150 else 0,  # Leo
-            'moon_dignity': 1 if 90 <= features['moon_longitude'] <= 120 else 0,  # Cancer
-            'mercury_dignity': 1 if (150 <= features['mercury_longitude'] <= 180 or 
-                                   330 <= features['mercury_longitude'] <= 360) else 0,  # Virgo/Gemini
-        })
-        
-        # Calculate all 92 minor planet longitudes
-        for category_name, category_planets in self.minor_planets.items():
-            for planet_key, planet_info in category_planets.items():
-                longitude = self._calculate_minor_planet_longitude(planet_info, observer)
-                feature_name = f"{category_name}_{planet_key}_longitude"
-                features[feature_name] = longitude
+        if 'dignities' in groups:
+            sun_lon = body_longitude['sun']
+            moon_lon = body_longitude['moon']
+            mercury_lon = body_longitude['mercury']
+            columns['sun_dignity'] = ((sun_lon >= 120) & (sun_lon <= 150)).astype(np.int64)  # Leo
+            columns['moon_dignity'] = ((moon_lon >= 90) & (moon_lon <= 120)).astype(np.int64)  # Cancer
+            columns['mercury_dignity'] = (((mercury_lon >= 150) & (mercury_lon <= 180)) |
+                                          ((mercury_lon >= 330) & (mercury_lon <= 360))).astype(np.int64)  # Virgo/Gemini
+        
+        # Minor planet longitudes (all bodies x all dates in one array evaluation)
+        for position, k in enumerate(minor_columns):
+            columns[self.minor_planet_table['feature_names'][k]] = selected_minor_longitudes[:, position]
+        
+        if 'all_body_aspects' in groups:
+            all_longitudes = np.column_stack([classical_longitudes, minor_longitudes])
+            for name, counts in self.aspect_engine.count_aspects(all_longitudes).items():
+                columns[f'all_body_{name}'] = counts
+        
+        if 'eclipse_detail' in groups:
+            columns['days_since_eclipse'] = days_since_eclipse
+            columns['days_until_eclipse'] = days_until_eclipse
+            days_since_lunar, days_until_lunar = self._eclipse_offsets_batch(dates, 'lunar')
+            columns['lunar_eclipse_proximity'] = np.minimum(days_since_lunar, days_until_lunar)
+            columns['days_since_lunar_eclipse'] = days_since_lunar
+            columns['days_until_lunar_eclipse'] = days_until_lunar
+        
+        if 'motion' in groups:
+            for name in CLASSICAL_BODIES:
+                speed = speeds[:, body_names.index(name)]
+                columns[f'{name}_speed'] = speed
+                columns[f'{name}_retrograde'] = (speed < 0).astype(np.int64)
+        
+        return columns
+    
+    def calculate_features_batch(self, start, end=None, as_frame=True, groups=None):
+        """
+        Calculate accurate astronomical features for many dates in one pass.
+        
+        Accepts either an inclusive (start, end) daily range or a single iterable of
+        dates (naive dates are taken as Chicago local dates). Only the ephemeris
+        calls remain per date; obliquity, houses, nodes, aspects, dignities and eclipse
+        proximity are evaluated once over the whole date vector.
+        
+        Positions are computed in a sweep over the requested dates plus the following
+        day, so daily motion comes from differencing consecutive positions instead of a
+        second ephemeris call per date. groups selects feature groups (see
+        FEATURE_GROUPS), e.g. 'motion' adds '<body>_speed' and '<body>_retrograde' for
+        all ten classical bodies; by default the calculator's feature_groups are used.
+        
+        Returns a DataFrame built directly from one NumPy array per feature, with the
+        same columns and order as calculate_features plus a trailing 'date' column,
+        or the dict of arrays itself when as_frame is False.
+        """
+        dates = self._normalize_batch_dates(start, end)
+        ephem_dates = self._to_ephem_dates(self.observation_times_utc(dates))
         
-        # Composite features removed - using individual features only
+        columns = self._calculate_feature_columns(dates, ephem_dates, groups)
         
-        return features
+        if not as_frame:
+            return columns
+        
+        features_df = pd.DataFrame(columns)
+        features_df['date'] = dates
+        return features_df
     
-    def _calculate_planet_speed(self, planet, observer):
+    def _normalize_hourly_times(self, start, end=None):
+        """
+        Hourly Chicago-local grid over an inclusive day range, or an iterable of
+        instants floored to the hour.
         """
-        Calculate planetary speed for retrograde detection.
+        if end is not None:
+            return pd.date_range(pd.Timestamp(start).normalize(),
+                                 pd.Timestamp(end).normalize() + pd.Timedelta(hours=23), freq='h')
+        
+        times = pd.DatetimeIndex(start if isinstance(start, (pd.Index, pd.Series, np.ndarray)) else list(start))
+        if times.tz is not None:
+            times = times.tz_convert(self.chicago_tz).tz_localize(None)
+        return times.floor('h')
+    
+    def calculate_features_hourly(self, start, end=None, as_frame=True, groups=None):
         """
-        # Calculate position now
-        planet.compute(observer)
-        current_pos = self._equatorial_to_ecliptic_longitude(planet.ra, planet.dec, observer)
+        Calculate features on an hourly Chicago-local grid instead of at the daily
+        observation time.
         
-        # Calculate position 1 day later (maintaining Chicago noon)
-        current_date_str = str(observer.date)
-        current_utc = datetime.strptime(current_date_str, '%Y/%m/%d %H:%M:%S')
-        future_chicago = current_utc.replace(tzinfo=pytz.UTC).astimezone(self.chicago_tz) + timedelta(days=1)
-        future_observer = self._create_observer(future_chicago.replace(tzinfo=None))
+        Accepts an inclusive (start, end) day range (24 local hours per day) or an
+        iterable of instants, which are floored to the hour. The whole grid goes through
+        one position sweep: every body is computed once per distinct instant with a
+        reused observer (ephemeris-table bodies are evaluated vectorized), and houses,
+        nodes, aspects and minor planets are evaluated over the full grid at once.
+        Daily motion compares each hour with the same local hour on the next day, whose
+        instants are almost all shared with the grid itself.
         
-        planet.compute(future_observer)
-        future_pos = self._equatorial_to_ecliptic_longitude(planet.ra, planet.dec, future_observer)
+        Returns the calculate_features_batch columns with a trailing hour-stamped 'date'
+        column, or the dict of arrays when as_frame is False.
+        """
+        times = self._normalize_hourly_times(start, end)
+        ephem_dates = self._to_ephem_dates(self.local_times_utc(times))
+        next_ephem_dates = self._to_ephem_dates(self.local_times_utc(times + pd.Timedelta(days=1)))
         
-        # Calculate speed (degrees per day)
-        speed = future_pos - current_pos
+        columns = self._calculate_feature_columns(times.normalize(), ephem_dates, groups, next_ephem_dates)
         
-        # Handle wrap-around
-        if speed > 180:
-            speed -= 360
-        elif speed < -180:
-            speed += 360
-            
-        return speed
+        if not as_frame:
+            return columns
+        
+        features_df = pd.DataFrame(columns)
+        features_df['date'] = times
+        return features_df
+    
+    def calculate_aspect_flags(self, start, end=None, include_minor_planets=True, packed=False):
+        """
+        Per-pair aspect flags for a date range or iterable of dates.
+        
+        Returns a sparse DataFrame (date, body_a, body_b, aspect) with one row per pair
+        in aspect, or with packed=True a dict of aspect name -> bit-packed uint8 array
+        of shape (dates, ceil(pairs / 8)) over np.triu_indices pair order.
+        """
+        dates = self._normalize_batch_dates(start, end)
+        groups = ['classical', 'minor_planets'] if include_minor_planets else ['classical']
+        columns = self.calculate_features_batch(dates, as_frame=False, groups=groups)
+        
+        body_names = [name[:-len('_longitude')] for name in columns]
+        longitudes = np.column_stack(list(columns.values()))
+        
+        if packed:
+            return self.aspect_engine.packed_aspect_flags(longitudes)
+        return self.aspect_engine.aspect_flags(longitudes, body_names, dates)
+    
+    def calculate_features_parallel(self, start, end=None, n_workers=None, chunk_size=None, hourly=False,
+                                    **batch_kwargs):
+        """
+        Process-pool version of calculate_features_batch (or of calculate_features_hourly
+        with hourly=True, where chunks are contiguous runs of hours).
+        
+        The sorted dates are split into contiguous chunks (so each chunk keeps the
+        next-day sharing of the position sweep), every worker process holds one
+        long-lived copy of this calculator, and chunk results are reassembled in date
+        order. Progress is reported once per finished chunk.
+        """
+        if hourly:
+            dates, method, unit = self._normalize_hourly_times(start, end), 'calculate_features_hourly', 'hours'
+        else:
+            dates, method, unit = self._normalize_batch_dates(start, end), 'calculate_features_batch', 'dates'
+        n_workers = n_workers or os.cpu_count() or 1
+        
+        if n_workers <= 1 or len(dates) < 2:
+            return getattr(self, method)(dates, **batch_kwargs)
+        
+        # A few chunks per worker keeps the pool busy when chunks finish unevenly
+        chunk_size = chunk_size or max(1, -(-len(dates) // (n_workers * 4)))
+        order = np.argsort(dates.values, kind='stable')
+        sorted_dates = dates[order]
+        chunks = [sorted_dates[i:i + chunk_size] for i in range(0, len(sorted_dates), chunk_size)]
+        
+        print(f"  Parallel feature generation: {len(chunks)} chunks of up to {chunk_size} {unit} "
+              f"on {n_workers} workers")
+        
+        chunk_results = [None] * len(chunks)
+        done_dates = 0
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(chunks)),
+                                 initializer=_init_feature_worker, initargs=(self,)) as executor:
+            futures = {executor.submit(_calculate_feature_chunk, method, chunk, batch_kwargs): k
+                       for k, chunk in enumerate(chunks)}
+            for finished, future in enumerate(as_completed(futures), start=1):
+                k = futures[future]
+                chunk_results[k] = future.result()
+                done_dates += len(chunks[k])
+                print(f"  Chunk {finished}/{len(chunks)}: {chunks[k][0].date()} to {chunks[k][-1].date()} "
+                      f"({done_dates}/{len(dates)} {unit}, {100*done_dates/len(dates):.1f}%)")
+        
+        features_df = pd.concat(chunk_results, ignore_index=True)
+        
+        # Back to the requested date order
+        features_df.index = order
+        return features_df.sort_index()
+
+
+# Long-lived calculator of a feature worker process (set by _init_feature_worker)
+_worker_calculator = None
+
+
+def _init_feature_worker(calculator):
+    """Process-pool initializer: keep one calculator per worker process."""
+    global _worker_calculator
+    _worker_calculator = calculator
+
+
+def _calculate_feature_chunk(method, dates, batch_kwargs):
+    """Calculate one contiguous chunk of dates in a worker process."""
+    return getattr(_worker_calculator, method)(dates, **batch_kwargs)
 
 
 def verify_calculations():
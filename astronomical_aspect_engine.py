@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Astronomical Aspect Engine
+==========================
+
+Vectorized pairwise aspect detection for any set of bodies over any number of dates.
+
+For a (dates, bodies) longitude array the engine builds the wrapped angular distance
+of every body pair (0-180 degrees) and classifies each pair against a configurable,
+ordered table of aspects. The first aspect whose orb matches wins, so with the default
+table a pair is a conjunction, an opposition or a square, never more than one.
+
+All-body work (classical plus 92 minor planets = 5,151 pairs per date) is processed in
+date chunks so memory stays bounded, and per-pair flags are returned sparse (COO) or
+bit-packed rather than as a dense boolean cube.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Aspect name -> (angle in degrees, orb in degrees); order sets precedence
+DEFAULT_ASPECTS = {
+    'conjunction': (0, 8),
+    'opposition': (180, 8),
+    'square': (90, 8),
+}
+
+
+class AspectEngine:
+    """
+    Pairwise aspect engine with configurable aspect angles and orbs.
+    """
+    
+    def __init__(self, aspects=None, chunk_size=1024):
+        self.aspects = dict(aspects if aspects is not None else DEFAULT_ASPECTS)
+        self.aspect_names = list(self.aspects)
+        # Angular distances are folded into 0-180, so 270 is the same aspect as 90
+        self.angles = np.array([min(angle % 360, 360 - angle % 360) for angle, _ in self.aspects.values()],
+                               dtype=float)
+        self.orbs = np.array([orb for _, orb in self.aspects.values()], dtype=float)
+        self.chunk_size = chunk_size
+    
+    def count_column_names(self):
+        """
+        Column names of the per-date aspect counts ('conjunctions', 'oppositions', ...).
+        """
+        return [f'{name}s' for name in self.aspect_names]
+    
+    def _pairs(self, n_bodies):
+        return np.triu_indices(n_bodies, k=1)
+    
+    def angular_distances(self, longitudes):
+        """
+        Wrapped angular distance (0-180 degrees) of every body pair.
+        
+        Returns a (dates, pairs) array; pair k is (body_i[k], body_j[k]) from np.triu_indices.
+        """
+        longitudes = np.asarray(longitudes, dtype=float)
+        i, j = self._pairs(longitudes.shape[1])
+        diff = np.abs(longitudes[:, i] - longitudes[:, j])
+        return np.minimum(diff, 360 - diff)
+    
+    def classify(self, longitudes):
+        """
+        Aspect index of every body pair (dates, pairs) as int8, -1 where no aspect applies.
+        """
+        distances = self.angular_distances(longitudes)
+        codes = np.full(distances.shape, -1, dtype=np.int8)
+        
+        # Assign in reverse precedence so earlier aspects overwrite later ones
+        for k in range(len(self.aspect_names) - 1, -1, -1):
+            codes[np.abs(distances - self.angles[k]) <= self.orbs[k]] = k
+        
+        return codes
+    
+    def count_aspects(self, longitudes):
+        """
+        Per-date count of each aspect over all body pairs.
+        
+        Returns a dict of count column name -> int64 array of length dates.
+        """
+        longitudes = np.asarray(longitudes, dtype=float)
+        counts = np.zeros((len(longitudes), len(self.aspect_names)), dtype=np.int64)
+        
+        for start in range(0, len(longitudes), self.chunk_size):
+            codes = self.classify(longitudes[start:start + self.chunk_size])
+            for k in range(len(self.aspect_names)):
+                counts[start:start + self.chunk_size, k] = (codes == k).sum(axis=1)
+        
+        return {name: counts[:, k] for k, name in enumerate(self.count_column_names())}
+    
+    def aspect_flags(self, longitudes, body_names, dates=None):
+        """
+        Sparse per-pair aspect flags.
+        
+        Returns a DataFrame with one row per (date, body pair) in aspect:
+        date (or date index), body_a, body_b, aspect.
+        """
+        longitudes = np.asarray(longitudes, dtype=float)
+        i, j = self._pairs(longitudes.shape[1])
+        date_chunks, pair_chunks, aspect_chunks = [], [], []
+        
+        for start in range(0, len(longitudes), self.chunk_size):
+            codes = self.classify(longitudes[start:start + self.chunk_size])
+            date_idx, pair_idx = np.nonzero(codes >= 0)
+            date_chunks.append(date_idx + start)
+            pair_chunks.append(pair_idx)
+            aspect_chunks.append(codes[date_idx, pair_idx])
+        
+        date_idx = np.concatenate(date_chunks) if date_chunks else np.empty(0, dtype=np.int64)
+        pair_idx = np.concatenate(pair_chunks) if pair_chunks else np.empty(0, dtype=np.int64)
+        aspect_idx = np.concatenate(aspect_chunks) if aspect_chunks else np.empty(0, dtype=np.int8)
+        
+        body_names = np.asarray(body_names)
+        return pd.DataFrame({
+            'date': np.asarray(dates)[date_idx] if dates is not None else date_idx,
+            'body_a': body_names[i[pair_idx]],
+            'body_b': body_names[j[pair_idx]],
+            'aspect': pd.Categorical.from_codes(aspect_idx, categories=self.aspect_names),
+        })
+    
+    def packed_aspect_flags(self, longitudes):
+        """
+        Bit-packed per-pair flags: a dict of aspect name -> uint8 array of shape
+        (dates, ceil(pairs / 8)), unpackable with np.unpackbits(axis=1).
+        """
+        longitudes = np.asarray(longitudes, dtype=float)
+        n_pairs = longitudes.shape[1] * (longitudes.shape[1] - 1) // 2
+        packed = {name: np.zeros((len(longitudes), (n_pairs + 7) // 8), dtype=np.uint8)
+                  for name in self.aspect_names}
+        
+        for start in range(0, len(longitudes), self.chunk_size):
+            codes = self.classify(longitudes[start:start + self.chunk_size])
+            for k, name in enumerate(self.aspect_names):
+                packed[name][start:start + self.chunk_size] = np.packbits(codes == k, axis=1)
+        
+        return packed
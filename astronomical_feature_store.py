@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Persistent Astronomical Feature Store
+=====================================
+
+Astronomical features never change for a given date, observer location, local
+observation time and calculator version, so they only need to be computed once.
+
+Layout (one directory per cache key):
+- manifest.json  - cache key, feature columns and their dtypes
+- dates.npy      - sorted datetime64[D] dates
+- features.npy   - float64 matrix of shape (features, dates), one contiguous row per feature
+
+Both .npy files are opened with mmap_mode='r', so lookups only touch the pages they need.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+
+class AstronomicalFeatureStore:
+    """
+    On-disk, memory-mappable cache of astronomical features keyed by calculator configuration.
+    """
+    
+    def __init__(self, calculator, root_dir='astronomical_feature_store'):
+        self.calculator = calculator
+        self.cache_key = calculator.cache_key()
+        key_digest = hashlib.sha256(json.dumps(self.cache_key, sort_keys=True).encode()).hexdigest()[:16]
+        self.store_dir = os.path.join(root_dir, key_digest)
+        self.manifest_path = os.path.join(self.store_dir, 'manifest.json')
+        self.dates_path = os.path.join(self.store_dir, 'dates.npy')
+        self.features_path = os.path.join(self.store_dir, 'features.npy')
+    
+    def _load(self):
+        """
+        Return (manifest, dates, features) memory-mapped from disk, or None if the store is empty.
+        """
+        if not os.path.exists(self.manifest_path):
+            return None
+        
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        dates = np.load(self.dates_path, mmap_mode='r')
+        features = np.load(self.features_path, mmap_mode='r')
+        return manifest, dates, features
+    
+    def __len__(self):
+        stored = self._load()
+        return 0 if stored is None else len(stored[1])
+    
+    def lookup(self, dates):
+        """
+        Split the requested dates into cached features and missing dates.
+        
+        Returns (cached_df, missing_dates) where cached_df has the calculator's columns
+        plus a trailing 'date' column, and missing_dates is a DatetimeIndex.
+        """
+        dates = self.calculator._normalize_batch_dates(dates)
+        stored = self._load()
+        if stored is None:
+            return None, dates
+        
+        manifest, stored_dates, stored_features = stored
+        requested = dates.values.astype('datetime64[D]')
+        positions = np.searchsorted(stored_dates, requested)
+        positions = np.minimum(positions, len(stored_dates) - 1)
+        found = stored_dates[positions] == requested
+        
+        cached_df = None
+        if found.any():
+            rows = positions[found]
+            cached_df = pd.DataFrame({
+                column: np.asarray(stored_features[k, rows]).astype(dtype)
+                for k, (column, dtype) in enumerate(zip(manifest['columns'], manifest['dtypes']))
+            })
+            cached_df['date'] = dates[found]
+        
+        return cached_df, dates[~found]
+    
+    def append(self, features_df):
+        """
+        Merge newly calculated features (calculate_features_batch output) into the store.
+        
+        The store is rewritten as a whole (one contiguous row per feature keeps lookups
+        cheap): about 8 MB and a few tens of milliseconds for the 116-feature set over
+        2001-2025, so appending one day per nightly update is still cheap.
+        """
+        if features_df is None or len(features_df) == 0:
+            return
+        
+        columns = [col for col in features_df.columns if col != 'date']
+        new_dates = pd.DatetimeIndex(features_df['date']).normalize().values.astype('datetime64[D]')
+        new_features = features_df[columns].to_numpy(dtype=np.float64).T
+        
+        stored = self._load()
+        if stored is None:
+            manifest = {
+                'cache_key': self.cache_key,
+                'columns': columns,
+                'dtypes': [str(features_df[col].dtype) for col in columns],
+            }
+            all_dates, all_features = new_dates, new_features
+        else:
+            manifest, stored_dates, stored_features = stored
+            if manifest['columns'] != columns:
+                raise ValueError("Feature columns do not match the existing feature store")
+            # New values win over stored ones for duplicate dates
+            keep = ~np.isin(stored_dates, new_dates)
+            all_dates = np.concatenate([np.asarray(stored_dates)[keep], new_dates])
+            all_features = np.concatenate([np.asarray(stored_features)[:, keep], new_features], axis=1)
+        
+        order = np.argsort(all_dates, kind='stable')
+        os.makedirs(self.store_dir, exist_ok=True)
+        
+        # Write to temporary files first so a crash never leaves a half-written store
+        for path, array in ((self.dates_path, all_dates[order]),
+                            (self.features_path, np.ascontiguousarray(all_features[:, order]))):
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, array)
+            os.replace(path + '.tmp', path)
+        
+        with open(self.manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(self.manifest_path + '.tmp', self.manifest_path)
+    
+    def get_features(self, dates, n_workers=1, chunk_size=None):
+        """
+        Return features for all dates, calculating and storing only the missing ones
+        (in parallel when n_workers > 1).
+        """
+        dates = self.calculator._normalize_batch_dates(dates)
+        unique_dates = dates.unique()
+        cached_df, missing_dates = self.lookup(unique_dates)
+        
+        print(f"✓ Feature store: {len(unique_dates) - len(missing_dates)} cached, {len(missing_dates)} to calculate")
+        
+        new_df = None
+        if len(missing_dates) or cached_df is None:
+            new_df = self.calculator.calculate_features_parallel(missing_dates, n_workers=n_workers,
+                                                                  chunk_size=chunk_size)
+            self.append(new_df)
+        
+        frames = [df for df in (cached_df, new_df) if df is not None and len(df)]
+        if not frames:
+            return new_df
+        features_df = pd.concat(frames, ignore_index=True)
+        
+        # Restore the requested order
+        order = pd.Index(features_df['date']).get_indexer(dates)
+        return features_df.iloc[order].reset_index(drop=True)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Hourly Astronomical Feature Benchmark
+=====================================
+
+Times the hourly-resolution feature build (calculate_features_hourly) over the
+study period: 2001-01-01 to 2025-08-18 is 215,904 local hours.
+
+Usage:
+    python benchmark_hourly_features.py                       # full period, all cores
+    python benchmark_hourly_features.py --workers 1 --ephemeris-table
+    python benchmark_hourly_features.py --start 2024-01-01 --end 2024-12-31
+"""
+
+import argparse
+import os
+import time
+from accurate_astronomical_calculator import AccurateAstronomicalCalculator
+
+
+def benchmark_hourly_features(start, end, n_workers, ephemeris_table):
+    """Build the hourly feature grid once and report throughput."""
+    print("⏱️  Benchmarking Hourly Astronomical Features")
+    print("=" * 50)
+    
+    calc = AccurateAstronomicalCalculator(ephemeris_table=ephemeris_table)
+    
+    started = time.perf_counter()
+    features_df = calc.calculate_features_parallel(start, end, n_workers=n_workers, hourly=True)
+    elapsed = time.perf_counter() - started
+    
+    print(f"\nPeriod: {start} to {end}")
+    print(f"Workers: {n_workers}, ephemeris table: {'yes' if ephemeris_table else 'no'}")
+    print(f"Instants: {len(features_df):,} hours x {len(features_df.columns) - 1} features")
+    print(f"Elapsed: {elapsed:.1f}s ({elapsed / 60:.2f} min), "
+          f"{len(features_df) / elapsed:,.0f} instants/s")
+    
+    return elapsed
+
+
+def main():
+    """Run the hourly feature benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the hourly astronomical feature build")
+    parser.add_argument('--start', default='2001-01-01')
+    parser.add_argument('--end', default='2025-08-18')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--ephemeris-table', action='store_true',
+                        help='evaluate Jupiter-Pluto from the Chebyshev ephemeris table')
+    args = parser.parse_args()
+    
+    benchmark_hourly_features(args.start, args.end, args.workers, args.ephemeris_table)
+
+
+if __name__ == "__main__":
+    main()
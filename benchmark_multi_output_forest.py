@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Multi-Output Forest Benchmark
+=============================
+
+Compares the per-code Random Forest loop with the single multi-output forest
+(perform_temporal_validation(multi_output=True)) on the persisted daily count cube:
+validation time, peak memory, serialized model size and per-code F1.
+
+Each mode runs in a fresh process so its peak memory is measured on its own. Per-code
+forests train in run_tasks worker processes, so memory is the peak resident set size
+of the whole process tree (the mode's process plus its workers), sampled from /proc
+(Linux).
+
+Usage:
+    python benchmark_multi_output_forest.py                  # all cores
+    python benchmark_multi_output_forest.py --cores 1 --cube-dir daily_count_cube
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from daily_count_cube import DailyCountCube
+from enhanced_accurate_fbi_analysis import COUNT_CUBE_DIR, EnhancedFBICrimeAnalysis
+
+
+def _tree_rss_mb(root_pid):
+    """Current resident set size of a process and all of its descendants in MB."""
+    parents, rss_pages = {}, {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue  # Exited while scanning
+        fields = stat[stat.rindex(')') + 2:].split()  # Fields after the command name
+        parents[int(entry)], rss_pages[int(entry)] = int(fields[1]), int(fields[21])
+    
+    tree = {root_pid}
+    while True:
+        children = {pid for pid, parent in parents.items() if parent in tree} - tree
+        if not children:
+            break
+        tree |= children
+    return sum(rss_pages.get(pid, 0) for pid in tree) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+
+class PeakTreeMemory:
+    """
+    Context manager sampling the resident set size of this process tree (worker
+    processes included) in a background thread and keeping its peak.
+    """
+    
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.baseline_mb = self.peak_mb = _tree_rss_mb(os.getpid())
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+    
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, _tree_rss_mb(os.getpid()))
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, _tree_rss_mb(os.getpid()))
+    
+    @property
+    def increase_mb(self):
+        """Peak memory above the memory at construction."""
+        return max(self.peak_mb - self.baseline_mb, 0.0)
+
+
+def _run_mode(cube_dir, feature_store_dir, multi_output, n_cores):
+    """Run temporal validation in one mode and measure it."""
+    analyzer = EnhancedFBICrimeAnalysis(feature_store_dir=feature_store_dir)
+    count_cube = DailyCountCube.load(cube_dir)
+    astronomical_df = analyzer.calculate_astronomical_features_for_dates(pd.DatetimeIndex(count_cube.dates))
+    
+    with PeakTreeMemory() as memory:
+        started = time.perf_counter()
+        results = analyzer.perform_temporal_validation(count_cube, astronomical_df, n_jobs=n_cores,
+                                                       multi_output=multi_output)
+        elapsed = time.perf_counter() - started
+    
+    models = {id(result['model']): result['model'] for result in results.values()}
+    return {
+        'elapsed': elapsed,
+        'memory_mb': memory.increase_mb,
+        'model_mb': sum(len(pickle.dumps(model)) for model in models.values()) / 1024 ** 2,
+        'f1': {fbi_code: result['f1_score'] for fbi_code, result in results.items()},
+    }
+
+
+def benchmark_multi_output_forest(cube_dir, feature_store_dir, n_cores):
+    """Run both modes and print the comparison."""
+    print("⏱️  Benchmarking Multi-Output Forest vs Per-Code Forests")
+    print("=" * 60)
+    
+    runs = {}
+    for label, multi_output in [('per-code', False), ('multi-output', True)]:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            runs[label] = executor.submit(_run_mode, cube_dir, feature_store_dir, multi_output, n_cores).result()
+    
+    print(f"\nCores: {n_cores}")
+    print(f"{'Mode':14s} {'Time (s)':>10s} {'Peak +MB':>10s} {'Model MB':>10s} {'Mean F1':>8s}")
+    for label, run in runs.items():
+        mean_f1 = sum(run['f1'].values()) / max(len(run['f1']), 1)
+        print(f"{label:14s} {run['elapsed']:10.1f} {run['memory_mb']:10.1f} {run['model_mb']:10.1f} {mean_f1:8.3f}")
+    
+    print(f"\n{'FBI code':10s} {'per-code':>9s} {'multi':>9s} {'diff':>8s}")
+    per_code, multi = runs['per-code']['f1'], runs['multi-output']['f1']
+    for fbi_code in per_code:
+        print(f"{fbi_code:10s} {per_code[fbi_code]:9.3f} {multi[fbi_code]:9.3f} "
+              f"{multi[fbi_code] - per_code[fbi_code]:+8.3f}")
+    
+    return runs
+
+
+def main():
+    """Run the multi-output forest benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the multi-output forest against per-code forests")
+    parser.add_argument('--cube-dir', default=COUNT_CUBE_DIR)
+    parser.add_argument('--feature-store', default='astronomical_feature_store')
+    parser.add_argument('--cores', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    
+    benchmark_multi_output_forest(args.cube_dir, args.feature_store, args.cores)
+
+
+if __name__ == "__main__":
+    main()
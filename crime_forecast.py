@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Crime Forecast Command
+======================
+
+Scores future (or past) date ranges with the models persisted by
+enhanced_accurate_fbi_analysis.py, without retraining.
+
+Astronomical features for the range are looked up in (or added to) the feature store
+in one batch, and every FBI code is scored on the same feature matrix.
+
+Usage:
+    python crime_forecast.py predict --start 2025-09-01 --end 2026-08-31
+    python crime_forecast.py predict --start 2026-01-01 --end 2026-01-31 --output january.csv
+"""
+
+import argparse
+import time
+import pandas as pd
+from enhanced_accurate_fbi_analysis import EnhancedFBICrimeAnalysis
+from forecast_models import MODEL_DIR, ForecastModels
+
+
+def predict(start, end, model_dir=MODEL_DIR, feature_store_dir='astronomical_feature_store',
+            output=None, n_workers=None):
+    """
+    Forecast high crime days for every FBI code from start to end (inclusive).
+    """
+    started = time.perf_counter()
+    models = ForecastModels.load(model_dir)
+    manifest = models.manifest
+    print(f"🔮 Forecasting {len(models.codes)} FBI codes with {manifest['engine']} models "
+          f"from {manifest['created']}")
+    
+    analyzer = EnhancedFBICrimeAnalysis(feature_store_dir=feature_store_dir,
+                                        feature_groups=manifest['feature_groups'],
+                                        ephemeris_table=manifest['ephemeris_table'] or None)
+    models.check_calculator(analyzer.astronomical_calc)
+    
+    dates = pd.date_range(start, end, freq='D')
+    astronomical_df = analyzer.calculate_astronomical_features_for_dates(dates, n_workers=n_workers)
+    forecast_df = models.predict(astronomical_df)
+    
+    output = output or f"crime_forecast_{dates[0]:%Y%m%d}_{dates[-1]:%Y%m%d}.csv"
+    forecast_df.to_csv(output, index=False)
+    
+    print(f"\n📅 Forecast: {dates[0].date()} to {dates[-1].date()} ({len(dates)} days)")
+    high_crime_days = forecast_df.groupby('fbi_code', sort=False)['high_crime'].sum()
+    for fbi_code, n_days in high_crime_days.items():
+        print(f"  {fbi_code}: {n_days} predicted high crime days")
+    print(f"✓ Forecast: {output} ({time.perf_counter() - started:.1f}s)")
+    
+    return forecast_df
+
+
+def main():
+    """Crime forecast command line."""
+    parser = argparse.ArgumentParser(description="Forecast high crime days from persisted models")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    predict_parser = commands.add_parser('predict', help='score every FBI code for a date range')
+    predict_parser.add_argument('--start', required=True, help='first date (YYYY-MM-DD)')
+    predict_parser.add_argument('--end', required=True, help='last date (YYYY-MM-DD), inclusive')
+    predict_parser.add_argument('--model-dir', default=MODEL_DIR)
+    predict_parser.add_argument('--feature-store', default='astronomical_feature_store')
+    predict_parser.add_argument('--output', help='forecast CSV (default crime_forecast_<start>_<end>.csv)')
+    predict_parser.add_argument('--workers', type=int, default=None,
+                                help='processes for features missing from the store (default: all cores)')
+    args = parser.parse_args()
+    
+    if args.command == 'predict':
+        predict(args.start, args.end, args.model_dir, args.feature_store, args.output, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Daily Crime Count Cube
+======================
+
+Dense integer crime counts (days x FBI codes) with a date index and a code index,
+replacing the wide float64 daily pivot (to_frame rebuilds it for CSV export). Hourly
+cubes (hours x FBI codes) use the same layout with a datetime64[h] index.
+
+Layout on disk (one directory):
+- manifest.json  - FBI codes (column order) and count dtype
+- dates.npy      - sorted datetime64[D] days (datetime64[h] hours for hourly cubes)
+- counts.npy     - int16/int32 matrix of shape (days, codes)
+- record_keys.npy - optional sorted uint64 hashes of every ingested record id, used to
+                    deduplicate incremental extracts (see add_records)
+
+Both .npy files are opened with mmap_mode='r' by default, so worker processes that
+load the same cube share its pages with zero copies.
+
+Cubes are built by DailyCountAggregator, which maps every record to an integer day
+offset and FBI code index and counts them with a single np.bincount per batch of
+records (a whole file or one streamed chunk).
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Unique record identifier column in the crime extracts
+RECORD_KEY_COLUMN = 'id'
+
+
+def hash_record_keys(keys):
+    """
+    64-bit hashes of record identifiers; keys are compared as strings so the
+    dtype they were parsed with does not matter.
+    """
+    return pd.util.hash_array(np.asarray(keys).astype(str))
+
+
+def valid_record_mask(dates, codes):
+    """
+    Records that are counted: those with both a date and an FBI code. Records missing
+    either are ignored, as groupby does.
+    """
+    return ~np.isnat(pd.DatetimeIndex(dates).values) & ~np.asarray(pd.isna(codes))
+
+
+class DailyCountCube:
+    """
+    Daily crime counts per FBI code as a compact, memory-mappable integer matrix.
+    """
+    
+    def __init__(self, counts, dates, codes, record_keys=None):
+        self.counts = counts  # (days, codes) int16/int32
+        dates = np.asarray(dates)
+        self.dates = dates if dates.dtype.kind == 'M' else dates.astype('datetime64[D]')  # sorted days or hours
+        self.codes = list(codes)
+        self.code_index = {code: k for k, code in enumerate(self.codes)}
+        self.record_keys = record_keys  # sorted uint64 hashes of ingested record ids, if tracked
+    
+    def __len__(self):
+        return len(self.dates)
+    
+    @staticmethod
+    def count_dtype(max_count):
+        """
+        Smallest integer dtype (int16 or int32) that holds max_count.
+        """
+        return np.int16 if max_count <= np.iinfo(np.int16).max else np.int32
+    
+    @classmethod
+    def from_pivot(cls, daily_pivot, record_keys=None):
+        """
+        Build a cube from a wide daily pivot (FBI code columns + 'date'),
+        optionally with the hashed ids of the records it counts.
+        """
+        codes = [col for col in daily_pivot.columns if col != 'date']
+        dates = pd.DatetimeIndex(daily_pivot['date']).normalize().values.astype('datetime64[D]')
+        counts = daily_pivot[codes].to_numpy()
+        
+        order = np.argsort(dates, kind='stable')
+        max_count = counts.max() if counts.size else 0
+        return cls(counts[order].astype(cls.count_dtype(max_count)), dates[order], codes,
+                   None if record_keys is None else np.unique(record_keys))
+    
+    def add_records(self, dates, codes, keys):
+        """
+        Count new crime records (timestamps, FBI codes, record ids), skipping ids already
+        in the cube or repeated within the extract. Records without a date or FBI code
+        are ignored, as by DailyCountAggregator.
+        
+        Returns (updated cube, sorted affected days as datetime64[D], number of new records).
+        Only the affected days change; new days and codes are inserted in order.
+        """
+        if self.record_keys is None:
+            raise ValueError("Count cube does not track record keys; rebuild it from the full history")
+        
+        valid = valid_record_mask(dates, codes)
+        dates = pd.DatetimeIndex(dates).values.astype(self.dates.dtype)[valid]
+        codes = np.asarray(codes)[valid].astype(str)
+        hashed = hash_record_keys(np.asarray(keys)[valid])
+        
+        # First occurrence of every id in the extract that has not been ingested yet;
+        # record_keys is sorted, so membership is a binary search per extract record
+        new = np.zeros(len(hashed), dtype=bool)
+        new[np.unique(hashed, return_index=True)[1]] = True
+        positions = np.searchsorted(self.record_keys, hashed)
+        if len(self.record_keys):
+            new &= self.record_keys[np.minimum(positions, len(self.record_keys) - 1)] != hashed
+        dates, codes, hashed, positions = dates[new], codes[new], hashed[new], positions[new]
+        
+        if not len(hashed):
+            return self, np.empty(0, dtype='datetime64[D]'), 0
+        
+        all_dates = np.union1d(self.dates, dates)
+        all_codes = self.codes + [str(code) for code in sorted(set(codes) - set(self.codes))]
+        code_index = {code: k for k, code in enumerate(all_codes)}
+        
+        counts = np.zeros((len(all_dates), len(all_codes)), dtype=np.int64)
+        counts[np.searchsorted(all_dates, self.dates), :len(self.codes)] = self.counts
+        np.add.at(counts, (np.searchsorted(all_dates, dates), [code_index[code] for code in codes]), 1)
+        
+        # Insert the new ids at their sorted positions (no re-sort of the whole history)
+        order = np.argsort(hashed, kind='stable')
+        record_keys = np.insert(self.record_keys, positions[order], hashed[order])
+        
+        cube = DailyCountCube(counts.astype(self.count_dtype(counts.max())), all_dates, all_codes, record_keys)
+        return cube, np.unique(dates), len(hashed)
+    
+    def column(self, code):
+        """
+        Counts of one FBI code over all days (a view, no copy).
+        """
+        return self.counts[:, self.code_index[code]]
+    
+    def date_positions(self, dates):
+        """
+        Row of every requested date (or hour, for hourly cubes) in the cube, -1 where
+        it is missing.
+        """
+        requested = pd.DatetimeIndex(dates).values.astype(self.dates.dtype)
+        if len(self.dates) == 0:
+            return np.full(len(requested), -1, dtype=np.intp)
+        
+        positions = np.minimum(np.searchsorted(self.dates, requested), len(self.dates) - 1)
+        return np.where(self.dates[positions] == requested, positions, -1)
+    
+    def to_frame(self, rows=None):
+        """
+        The equivalent wide daily pivot (float64 counts + 'date'),
+        for all days or the given rows.
+        """
+        rows = slice(None) if rows is None else rows
+        daily_pivot = pd.DataFrame(np.asarray(self.counts[rows], dtype=np.float64),
+                                   columns=pd.Index(self.codes, name='fbi_code'))
+        daily_pivot['date'] = pd.DatetimeIndex(self.dates[rows])
+        return daily_pivot
+    
+    def save(self, cube_dir):
+        """
+        Persist the cube as memory-mappable .npy files.
+        """
+        os.makedirs(cube_dir, exist_ok=True)
+        
+        # Write to temporary files first so a crash never leaves a half-written cube
+        arrays = [('dates.npy', self.dates), ('counts.npy', np.ascontiguousarray(self.counts))]
+        keys_path = os.path.join(cube_dir, 'record_keys.npy')
+        if self.record_keys is not None:
+            arrays.append(('record_keys.npy', self.record_keys))
+        elif os.path.exists(keys_path):
+            os.remove(keys_path)  # Stale keys from a previous cube
+        
+        for name, array in arrays:
+            path = os.path.join(cube_dir, name)
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, array)
+            os.replace(path + '.tmp', path)
+        
+        manifest_path = os.path.join(cube_dir, 'manifest.json')
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump({'codes': self.codes, 'dtype': str(self.counts.dtype)}, f, indent=2)
+        os.replace(manifest_path + '.tmp', manifest_path)
+    
+    @classmethod
+    def load(cls, cube_dir, mmap_mode='r'):
+        """
+        Load a saved cube, memory-mapped read-only by default (mmap_mode=None reads it into memory).
+        """
+        with open(os.path.join(cube_dir, 'manifest.json')) as f:
+            manifest = json.load(f)
+        counts = np.load(os.path.join(cube_dir, 'counts.npy'), mmap_mode=mmap_mode)
+        dates = np.load(os.path.join(cube_dir, 'dates.npy'), mmap_mode=mmap_mode)
+        keys_path = os.path.join(cube_dir, 'record_keys.npy')
+        record_keys = np.load(keys_path, mmap_mode=mmap_mode) if os.path.exists(keys_path) else None
+        return cls(counts, dates, manifest['codes'], record_keys)
+
+
+class DailyCountAggregator:
+    """
+    Bincount aggregation of crime records into daily (unit='D') or hourly (unit='h')
+    counts per FBI code.
+    
+    Call add() once for a whole file or once per streamed chunk; the running
+    (days x codes) matrix only grows to cover the days and codes seen so far.
+    """
+    
+    def __init__(self, unit='D'):
+        self.unit = unit
+        self.first_day = None  # days (or hours) since 1970-01-01 of row 0
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.codes = []
+        self.code_index = {}
+    
+    def add(self, dates, codes):
+        """
+        Count a batch of records given their timestamps and FBI codes. Records with a
+        missing date or code are ignored, as groupby does.
+        """
+        days = np.asarray(pd.DatetimeIndex(dates).values.astype(f'datetime64[{self.unit}]'))
+        codes = pd.Categorical(codes)
+        
+        # Local category codes -> global code index (new codes get new columns)
+        for code in codes.categories:
+            if code not in self.code_index:
+                self.code_index[code] = len(self.codes)
+                self.codes.append(code)
+        global_codes = np.array([self.code_index[code] for code in codes.categories], dtype=np.int64)
+        
+        valid = ~np.isnat(days) & (codes.codes >= 0)  # valid_record_mask
+        day_numbers = days[valid].astype(np.int64)
+        code_numbers = global_codes[codes.codes[valid]]
+        if not len(day_numbers):
+            return
+        
+        first_day, last_day = day_numbers.min(), day_numbers.max()
+        n_codes = len(self.codes)
+        
+        # One bincount over the combined (day offset, code) index
+        combined = (day_numbers - first_day) * n_codes + code_numbers
+        batch = np.bincount(combined, minlength=(last_day - first_day + 1) * n_codes).reshape(-1, n_codes)
+        
+        self._grow(first_day, last_day, n_codes)
+        start = first_day - self.first_day
+        self.counts[start:start + len(batch)] += batch
+    
+    def _grow(self, first_day, last_day, n_codes):
+        """
+        Extend the running matrix to cover [first_day, last_day] and n_codes codes.
+        """
+        if self.first_day is None:
+            self.first_day = first_day
+        current_last = self.first_day + len(self.counts) - 1
+        new_first = min(self.first_day, first_day)
+        new_last = max(current_last, last_day)
+        
+        if new_first == self.first_day and new_last == current_last and n_codes == self.counts.shape[1]:
+            return
+        
+        counts = np.zeros((new_last - new_first + 1, n_codes), dtype=np.int64)
+        offset = self.first_day - new_first
+        counts[offset:offset + len(self.counts), :self.counts.shape[1]] = self.counts
+        self.first_day, self.counts = new_first, counts
+    
+    def to_cube(self, record_keys=None):
+        """
+        DailyCountCube of the days with at least one record, FBI codes sorted as in the pivot.
+        """
+        rows = np.flatnonzero(self.counts.any(axis=1))
+        order = sorted(range(len(self.codes)), key=lambda k: self.codes[k])
+        counts = self.counts[rows][:, order]
+        dates = (np.datetime64(0, self.unit) + (self.first_day or 0) + rows).astype(f'datetime64[{self.unit}]')
+        
+        max_count = counts.max() if counts.size else 0
+        return DailyCountCube(counts.astype(DailyCountCube.count_dtype(max_count)), dates,
+                              [self.codes[k] for k in order],
+                              None if record_keys is None else np.unique(record_keys))
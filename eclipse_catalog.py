@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Eclipse Catalog Generator
+=========================
+
+Generates the solar and lunar eclipse catalog used for the eclipse features,
+offline, with PyEphem, and caches it as a small CSV next to this module.
+
+Method:
+- Every new moon (solar) and full moon (lunar) in the range is found with PyEphem
+- A solar eclipse occurs when the Moon's geocentric ecliptic latitude at conjunction
+  is below pi_moon - pi_sun + s_moon + s_sun (parallaxes and semidiameters)
+- A lunar eclipse (penumbral or deeper) occurs when the latitude at opposition is
+  below the penumbral shadow radius 1.02 * (pi_moon + pi_sun + s_sun) + s_moon
+
+For 2001-2025 this reproduces the previously hard-coded solar eclipse list exactly.
+
+Usage:
+    python eclipse_catalog.py            # regenerate eclipse_catalog_1990_2040.csv
+"""
+
+import csv
+import math
+import os
+import ephem
+from datetime import datetime
+
+# Years the cached catalog is guaranteed to cover
+ECLIPSE_CATALOG_START_YEAR = 1990
+ECLIPSE_CATALOG_END_YEAR = 2040
+
+ECLIPSE_CATALOG_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    f'eclipse_catalog_{ECLIPSE_CATALOG_START_YEAR}_{ECLIPSE_CATALOG_END_YEAR}.csv')
+
+EARTH_RADIUS_AU = 6378.137 / 149597870.7
+
+
+def _find_eclipses(eclipse_type, start, end):
+    """
+    Find all eclipses of one type ('solar' or 'lunar') between two PyEphem dates.
+    """
+    next_syzygy = ephem.next_new_moon if eclipse_type == 'solar' else ephem.next_full_moon
+    eclipses = []
+    
+    date = next_syzygy(start)
+    while date <= end:
+        moon = ephem.Moon(date)
+        sun = ephem.Sun(date)
+        
+        moon_latitude = abs(float(ephem.Ecliptic(moon).lat))
+        moon_parallax = math.asin(EARTH_RADIUS_AU / moon.earth_distance)
+        sun_parallax = math.asin(EARTH_RADIUS_AU / sun.earth_distance)
+        moon_semidiameter = float(moon.radius)
+        sun_semidiameter = float(sun.radius)
+        
+        if eclipse_type == 'solar':
+            limit = moon_parallax - sun_parallax + moon_semidiameter + sun_semidiameter
+        else:
+            limit = 1.02 * (moon_parallax + sun_parallax + sun_semidiameter) + moon_semidiameter
+        
+        if moon_latitude < limit:
+            eclipses.append((date.datetime(), eclipse_type))
+        
+        date = next_syzygy(ephem.Date(date + 1))
+    
+    return eclipses
+
+
+def generate_eclipse_catalog(start_year=ECLIPSE_CATALOG_START_YEAR, end_year=ECLIPSE_CATALOG_END_YEAR):
+    """
+    Generate all solar and lunar eclipses for the given years (inclusive), plus one
+    year of margin on each side so every covered date has a previous and next eclipse.
+    
+    Returns a date-sorted list of (UTC datetime of greatest eclipse approximation, type).
+    """
+    start = ephem.Date(datetime(start_year - 1, 1, 1))
+    end = ephem.Date(datetime(end_year + 2, 1, 1))
+    
+    eclipses = _find_eclipses('solar', start, end) + _find_eclipses('lunar', start, end)
+    return sorted(eclipses)
+
+
+def load_eclipse_catalog(path=ECLIPSE_CATALOG_FILE):
+    """
+    Load the cached eclipse catalog, generating and caching it first if it is missing.
+    
+    Returns a date-sorted list of (date, type) with type 'solar' or 'lunar'.
+    """
+    if not os.path.exists(path):
+        write_eclipse_catalog(generate_eclipse_catalog(), path)
+    
+    with open(path, newline='') as f:
+        return [(datetime.strptime(row['date'], '%Y-%m-%d'), row['type']) for row in csv.DictReader(f)]
+
+
+def write_eclipse_catalog(eclipses, path=ECLIPSE_CATALOG_FILE):
+    """
+    Write a generated eclipse catalog to CSV (date, type).
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['date', 'type'])
+        for eclipse_time, eclipse_type in eclipses:
+            writer.writerow([eclipse_time.strftime('%Y-%m-%d'), eclipse_type])
+
+
+def main():
+    """
+    Regenerate the cached eclipse catalog.
+    """
+    print(f"🌑 Generating eclipse catalog {ECLIPSE_CATALOG_START_YEAR}-{ECLIPSE_CATALOG_END_YEAR}...")
+    eclipses = generate_eclipse_catalog()
+    write_eclipse_catalog(eclipses)
+    
+    solar = sum(1 for _, eclipse_type in eclipses if eclipse_type == 'solar')
+    print(f"✓ {solar} solar and {len(eclipses) - solar} lunar eclipses")
+    print(f"✓ Saved to {ECLIPSE_CATALOG_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,25 +13,298 @@ Key Features:
 - Extended temporal validation (2001-2020 vs 2021-2025)
 """
 
+import argparse
+import json
+import os
+import zlib
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, f1_score
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import classification_report, f1_score, precision_score, recall_score
 from sklearn.preprocessing import StandardScaler
+from sklearn.utils.class_weight import compute_class_weight
+from threadpoolctl import threadpool_limits
 import warnings
 from accurate_astronomical_calculator import AccurateAstronomicalCalculator
+from astronomical_feature_store import AstronomicalFeatureStore
+from feature_binning import FeatureBinner
+from forecast_models import MODEL_DIR, save_forecast_models
+from parallel_training import plan_core_budget, run_tasks
+from daily_count_cube import (DailyCountAggregator, DailyCountCube, RECORD_KEY_COLUMN, hash_record_keys,
+                              valid_record_mask)
+from crime_data_store import (CRIME_DATA_FILE, CRIME_DATE_FORMAT, CRIME_STORE_DIR, parse_crime_dates,
+                              crime_store_columns, crime_store_years, load_crime_records)
 import pytz
 
 warnings.filterwarnings('ignore')
 
+COUNT_CUBE_DIR = 'daily_count_cube'
+
+# Crime + astronomy dataset maintained by incremental updates, one CSV per year
+# (year=2001.csv, ...) so an update rewrites only the years it touches. Full runs
+# rewrite every year; manifest.json records the calculator the features came from.
+COMBINED_DATASET_DIR = 'combined_crime_astronomy'
+COMBINED_MANIFEST_FILE = 'manifest.json'
+
+# Per-code model engines for perform_temporal_validation
+MODEL_ENGINES = ('random_forest', 'hist_gradient_boosting')
+
+# Permutation repeats behind the feature importances of models without
+# feature_importances_ (histogram gradient boosting)
+PERMUTATION_IMPORTANCE_REPEATS = 5
+
+# FBI codes analyzed (plus any 'FBI_' prefixed columns)
+ANALYSIS_FBI_CODES = [
+    '01A', '01B', '02', '03', '04A', '04B', '05', '06', '07', '08A', '08B', 
+    '09', '10', '11', '12', '13', '14', '15', '16', '17', '18', '19', '20', 
+    '22', '24', '26'
+]
+
+
+def combined_dataset_years(combined_dir=COMBINED_DATASET_DIR):
+    """
+    Years available in the year-partitioned combined dataset, sorted.
+    """
+    if not os.path.isdir(combined_dir):
+        return []
+    return sorted(int(name[len('year='):-len('.csv')]) for name in os.listdir(combined_dir)
+                  if name.startswith('year=') and name.endswith('.csv'))
+
+
+def load_combined_dataset(combined_dir=COMBINED_DATASET_DIR, years=None):
+    """
+    Load the combined dataset (all years by default) as one DataFrame in date order.
+    
+    Years written before an FBI code first appeared lack its column; those days had
+    no crimes of that code, so the missing counts are filled with 0.
+    """
+    years = None if years is None else set(years)
+    frames = [pd.read_csv(os.path.join(combined_dir, f'year={year}.csv'), parse_dates=['date'],
+                          float_precision='round_trip')
+              for year in combined_dataset_years(combined_dir) if years is None or year in years]
+    if not frames:
+        return pd.DataFrame()
+    
+    columns = list(dict.fromkeys(column for frame in frames for column in frame.columns))
+    return pd.concat([frame.reindex(columns=columns, fill_value=0) for frame in frames], ignore_index=True)
+
+
+def _write_csv_atomic(df, path):
+    """Write a CSV via a temporary file so a crash never leaves a partial file."""
+    df.to_csv(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+
+
+def high_crime_threshold(train_counts, percentile=50):
+    """
+    Count threshold for a high crime day: the given percentile of the nonzero training
+    days (1 when there are 10 or fewer of them).
+    """
+    nonzero = train_counts[train_counts > 0]
+    return np.percentile(nonzero, percentile) if len(nonzero) > 10 else 1
+
+
+def _fit_code_model(arrays, task, n_jobs):
+    """
+    Train the Random Forest for one FBI code on the shared feature matrices and
+    predict the test period (run in-process or in a training worker).
+    """
+    model = RandomForestClassifier(
+        n_estimators=100,
+        max_depth=10,
+        min_samples_split=10,
+        random_state=42,
+        class_weight=task['class_weight'],
+        n_jobs=n_jobs
+    )
+    
+    model.fit(arrays['X_train'], task['y_train'])
+    return model, _predict_test(model, arrays['X_test'], task)
+
+
+def _fit_code_boosting_model(arrays, task, n_jobs):
+    """
+    Train the histogram gradient-boosting model for one FBI code on the shared uint8
+    bin codes and predict the test period (OpenMP threads limited to n_jobs).
+    """
+    model = HistGradientBoostingClassifier(
+        max_iter=200,
+        learning_rate=0.1,
+        max_leaf_nodes=31,
+        min_samples_leaf=20,
+        early_stopping=False,
+        random_state=42,
+        class_weight=task['class_weight']
+    )
+    
+    with threadpool_limits(limits=n_jobs, user_api='openmp'):
+        model.fit(arrays['X_train'], task['y_train'])
+        return model, _predict_test(model, arrays['X_test'], task)
+
+
+def _predict_test(model, X_test, task):
+    """
+    Test-period predictions of a fitted per-code model: class labels, or the
+    high-crime probabilities when the task asks for them.
+    """
+    if task.get('probabilities'):
+        return model.predict_proba(X_test)[:, 1]
+    return model.predict(X_test)
+
+
+def _fit_fold_model(arrays, task, n_jobs):
+    """
+    Train one FBI code's model on a walk-forward fold and predict its test year.
+    
+    Rows are sorted by date, so the fold's training rows are a prefix of the shared
+    feature matrix and its test rows the block right after it (views, no copies).
+    """
+    X = arrays['X']
+    split = {'X_train': X[:task['train_rows']], 'X_test': X[task['train_rows']:task['test_rows']]}
+    fit_function = _fit_code_boosting_model if task['engine'] == 'hist_gradient_boosting' else _fit_code_model
+    return fit_function(split, task, n_jobs)[1]
+
+
+def _fit_sweep_model(arrays, task, n_jobs):
+    """
+    Train one FBI code's model for a threshold sweep target and return only its
+    test-period high-crime probabilities.
+    """
+    fit_function = _fit_code_boosting_model if task['engine'] == 'hist_gradient_boosting' else _fit_code_model
+    return fit_function(arrays, dict(task, probabilities=True), n_jobs)[1]
+
+
+def cutoff_metrics(y_true, probabilities, cutoffs):
+    """
+    Precision, recall, F1 and predicted positives for every decision cutoff (predict
+    high crime when probability > cutoff, the rule of predict() at 0.5, so ties at the
+    cutoff are negative) in one vectorized pass.
+    
+    Probabilities are sorted once in descending order: the days predicted positive at
+    a cutoff are a prefix of that order, so true positives are read off a cumulative
+    sum at the prefix length. Returns a dict of arrays aligned with cutoffs.
+    """
+    y_true = np.asarray(y_true)
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    cutoffs = np.asarray(cutoffs, dtype=np.float64)
+    
+    order = np.argsort(-probabilities, kind='stable')
+    true_positives = np.concatenate([[0], np.cumsum(y_true[order] == 1)])
+    
+    # Number of probabilities > each cutoff
+    predicted = len(probabilities) - np.searchsorted(np.sort(probabilities), cutoffs, side='right')
+    tp = true_positives[predicted]
+    actual = np.sum(y_true == 1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(actual > 0, tp / max(actual, 1), 0.0)
+        f1 = np.where(predicted + actual > 0, 2 * tp / (predicted + actual), 0.0)
+    
+    return {'precision': precision, 'recall': recall, 'f1_score': f1, 'predicted_positive': predicted}
+
+
+def _binary_f1_scores(y_true, y_preds):
+    """
+    F1 score of every row of y_preds (repeats x days) against y_true, 0 when undefined.
+    """
+    true_positives = np.sum((y_preds == 1) & (y_true == 1), axis=1)
+    denominator = np.sum(y_preds == 1, axis=1) + np.sum(y_true == 1)
+    return np.where(denominator > 0, 2 * true_positives / np.maximum(denominator, 1), 0.0)
+
+
+def _permutation_importance_task(arrays, task, n_jobs):
+    """
+    Permutation importance of a chunk of features for one FBI code on the shared test
+    matrix: the drop in F1 when a feature's column is shuffled, for every repeat.
+    
+    The test matrix is tiled once into a preallocated (repeats x days) buffer; each
+    feature shuffles only its own column in the buffer (one permutation per repeat),
+    scores all repeats in a single predict call and restores the column. Permutations
+    are seeded per (code, feature), so results do not depend on the chunking or on
+    which other codes are scored.
+    
+    Returns a (features in chunk, repeats) array of importances.
+    """
+    X_test, y_test, model = arrays['X_test'], task['y_test'], task['model']
+    n_days, n_repeats = len(X_test), task['n_repeats']
+    
+    def predict(X):
+        y_pred = model.predict(X)
+        return y_pred if task['output'] is None else y_pred[:, task['output']]
+    
+    # Serial runs score the caller's fitted model itself: restore its n_jobs afterwards
+    model_n_jobs = getattr(model, 'n_jobs', None)
+    if hasattr(model, 'n_jobs'):
+        model.n_jobs = n_jobs
+    try:
+        with threadpool_limits(limits=n_jobs, user_api='openmp'):
+            baseline = _binary_f1_scores(y_test, predict(X_test)[None, :])[0]
+            buffer = np.tile(X_test, (n_repeats, 1))
+            importances = np.empty((len(task['features']), n_repeats))
+            
+            for i, j in enumerate(task['features']):
+                rng = np.random.default_rng([*task['seed'], j])
+                for r in range(n_repeats):
+                    buffer[r * n_days:(r + 1) * n_days, j] = X_test[rng.permutation(n_days), j]
+                
+                y_preds = predict(buffer).reshape(n_repeats, n_days)
+                importances[i] = baseline - _binary_f1_scores(y_test, y_preds)
+                buffer[:, j] = np.tile(X_test[:, j], n_repeats)
+    finally:
+        if hasattr(model, 'n_jobs'):
+            model.n_jobs = model_n_jobs
+    
+    return importances
+
+
+def _fit_multi_output_model(X_train, X_test, tasks, n_jobs):
+    """
+    Train one multi-output Random Forest on every code's binary target at once and
+    predict the test period. Returns (shared model, y_pred) per task.
+    
+    scikit-learn multiplies the per-output class weights into a single sample weight,
+    so 'balanced' is expanded per code from that code's training targets.
+    """
+    Y_train = np.column_stack([task['y_train'] for task in tasks])
+    class_weight = []
+    for task in tasks:
+        weight = task['class_weight']
+        if weight == 'balanced':
+            classes = np.unique(task['y_train'])
+            weight = dict(zip(classes, compute_class_weight('balanced', classes=classes, y=task['y_train'])))
+        class_weight.append(weight)
+    
+    model = RandomForestClassifier(
+        n_estimators=100,
+        max_depth=10,
+        min_samples_split=10,
+        random_state=42,
+        class_weight=class_weight,
+        n_jobs=n_jobs
+    )
+    
+    model.fit(X_train, Y_train)
+    Y_pred = model.predict(X_test)
+    return [(model, Y_pred[:, k]) for k in range(len(tasks))]
+
+
 class EnhancedFBICrimeAnalysis:
     """
     Enhanced FBI crime analysis with accurate astronomical calculations.
     """
     
-    def __init__(self):
-        self.astronomical_calc = AccurateAstronomicalCalculator()
+    def __init__(self, feature_store_dir='astronomical_feature_store', feature_groups=None,
+                 ephemeris_table=None):
+        # feature_groups selects astronomical feature groups for ablation runs,
+        # e.g. CORE_FEATURE_GROUPS; None uses the full 116-feature set.
+        # ephemeris_table=True evaluates Jupiter-Pluto from the Chebyshev tables.
+        self.astronomical_calc = AccurateAstronomicalCalculator(feature_groups=feature_groups,
+                                                                ephemeris_table=ephemeris_table)
+        # Persistent feature cache; pass feature_store_dir=None to always recompute
+        self.feature_store = (AstronomicalFeatureStore(self.astronomical_calc, feature_store_dir)
+                              if feature_store_dir else None)
         self.chicago_tz = pytz.timezone('America/Chicago')
         self.fbi_codes = {}
         self.models = {}
@@ -40,15 +313,28 @@ class EnhancedFBICrimeAnalysis:
         print("✓ Using accurate astronomical calculations")
         print("✓ Chicago local time zone consistency")
     
-    def load_and_process_crime_data(self):
+    def load_and_process_crime_data(self, store_dir=CRIME_STORE_DIR, years=None, n_workers=None):
         """
         Load and process Chicago crime data with proper date handling.
+        
+        Reads date and fbi_code for the requested years (all by default) from the
+        year-partitioned crime store when it exists (see crime_data_store.py),
+        otherwise parses the full CSV.
         """
         print("\n📊 Loading Chicago crime data...")
         
+        if crime_store_years(store_dir):
+            columns = ['date', 'fbi_code'] + ([RECORD_KEY_COLUMN]
+                                              if RECORD_KEY_COLUMN in crime_store_columns(store_dir) else [])
+            df = load_crime_records(store_dir, columns, years=years, n_workers=n_workers)
+            print(f"✓ Loaded {len(df):,} crime records from {store_dir}")
+            print(f"✓ Date range: {df['date'].min()} to {df['date'].max()}")
+            print(f"✓ FBI codes found: {df['fbi_code'].nunique()}")
+            return df
+        
         # Load the comprehensive crime dataset
         try:
-            df = pd.read_csv('chicago_crime_complete_all_months.csv')
+            df = pd.read_csv(CRIME_DATA_FILE)
             print(f"✓ Loaded {len(df):,} crime records")
         except FileNotFoundError:
             print("❌ Crime data file not found. Please ensure chicago_crime_complete_all_months.csv exists.")
@@ -70,110 +356,371 @@ class EnhancedFBICrimeAnalysis:
     def aggregate_daily_crime_data(self, df):
         """
         Aggregate crime data by day and FBI code for daily analysis.
+        
+        Returns a DailyCountCube (days with at least one crime x sorted FBI codes) that
+        also holds the hashed ids of the counted records when the records have an id column.
         """
         print("\n📅 Aggregating crime data by day...")
         
-        # Create date-only column for daily aggregation
-        df['date_only'] = df['date'].dt.date
+        record_keys = None
+        if RECORD_KEY_COLUMN in df.columns:
+            record_keys = hash_record_keys(df[RECORD_KEY_COLUMN][valid_record_mask(df['date'], df['fbi_code'])])
+        
+        # Count records per (day offset, FBI code index) with one bincount
+        aggregator = DailyCountAggregator()
+        aggregator.add(df['date'], df['fbi_code'])
+        count_cube = aggregator.to_cube(record_keys)
+        
+        print(f"✓ Created daily aggregation: {len(count_cube)} days")
+        print(f"✓ FBI codes: {count_cube.codes}")
         
-        # Aggregate by date and FBI code
-        daily_counts = df.groupby(['date_only', 'fbi_code']).size().reset_index(name='crime_count')
+        return count_cube
+    
+    def aggregate_hourly_crime_data(self, df):
+        """
+        Aggregate crime data by local hour and FBI code for hourly analysis.
         
-        # Pivot to get FBI codes as columns
-        daily_pivot = daily_counts.pivot(index='date_only', columns='fbi_code', values='crime_count').fillna(0)
+        Returns an hourly DailyCountCube (hours with at least one crime x FBI codes).
+        """
+        print("\n🕐 Aggregating crime data by hour...")
         
-        # Reset index and convert date back to datetime
-        daily_pivot = daily_pivot.reset_index()
-        daily_pivot['date'] = pd.to_datetime(daily_pivot['date_only'])
-        daily_pivot = daily_pivot.drop('date_only', axis=1)
+        aggregator = DailyCountAggregator(unit='h')
+        aggregator.add(df['date'], df['fbi_code'])
+        count_cube = aggregator.to_cube()
         
-        print(f"✓ Created daily aggregation: {len(daily_pivot)} days")
-        print(f"✓ FBI codes: {[col for col in daily_pivot.columns if col != 'date']}")
+        print(f"✓ Created hourly aggregation: {len(count_cube)} hours")
+        print(f"✓ FBI codes: {count_cube.codes}")
         
-        return daily_pivot
+        return count_cube
     
-    def calculate_astronomical_features_for_dates(self, dates):
+    def stream_daily_crime_data(self, path=CRIME_DATA_FILE, chunksize=1_000_000, date_format=CRIME_DATE_FORMAT,
+                                record_keys=True):
         """
-        Calculate accurate astronomical features for all dates.
+        Streaming equivalent of load_and_process_crime_data + aggregate_daily_crime_data.
+        
+        Reads only date, fbi_code (categorical) and the record id in chunks with a fixed
+        date format and bincounts each chunk into the daily counts, so peak memory depends on
+        days x FBI codes rather than on the number of records. Returns the same DailyCountCube.
+        
+        The one exception is the record id hashes kept so incremental updates can skip
+        already ingested records: 8 bytes per record (~70 MB for 8.4M records).
+        record_keys=False skips the id column; the resulting cube then cannot take
+        incremental extracts (update_with_new_extract).
         """
-        print(f"\n🌌 Calculating astronomical features for {len(dates)} dates...")
+        print("\n📊 Streaming Chicago crime data...")
         
-        astronomical_data = []
+        columns = ('date', 'fbi_code', RECORD_KEY_COLUMN) if record_keys else ('date', 'fbi_code')
+        try:
+            reader = pd.read_csv(path, usecols=lambda col: col in columns,
+                                 dtype={'date': str, 'fbi_code': 'category', RECORD_KEY_COLUMN: str},
+                                 chunksize=chunksize)
+        except FileNotFoundError:
+            print(f"❌ Crime data file not found. Please ensure {path} exists.")
+            return None
         
-        for i, date in enumerate(dates):
-            if i % 500 == 0:
-                print(f"  Progress: {i}/{len(dates)} ({100*i/len(dates):.1f}%)")
-            
-            # Convert to Chicago timezone for consistency (assuming input is already Chicago local time)
-            if hasattr(date, 'tzinfo') and date.tzinfo is not None:
-                chicago_date = date.astimezone(self.chicago_tz)
-            else:
-                # Assume naive datetime is already in Chicago local time
-                chicago_date = date
+        aggregator = DailyCountAggregator()
+        key_chunks = []
+        n_records = 0
+        
+        for chunk in reader:
+            # Naive Chicago local time, as in load_and_process_crime_data
+            dates = parse_crime_dates(chunk['date'], date_format)
+            aggregator.add(dates, chunk['fbi_code'])
             
-            # Calculate features at noon Chicago time
-            features = self.astronomical_calc.calculate_features(chicago_date)
-            # Convert date to match the format from daily_crime_df
-            features['date'] = pd.to_datetime(date.date() if hasattr(date, 'date') else date)
-            astronomical_data.append(features)
+            if RECORD_KEY_COLUMN in chunk.columns:
+                valid = valid_record_mask(dates, chunk['fbi_code'])
+                key_chunks.append(hash_record_keys(chunk[RECORD_KEY_COLUMN][valid]))
+            n_records += len(chunk)
+        
+        print(f"✓ Streamed {n_records:,} crime records")
+        count_cube = aggregator.to_cube(np.concatenate(key_chunks) if key_chunks else None)
+        
+        print(f"✓ Created daily aggregation: {len(count_cube)} days")
+        print(f"✓ FBI codes: {count_cube.codes}")
         
-        astronomical_df = pd.DataFrame(astronomical_data)
+        return count_cube
+    
+    def calculate_astronomical_features_for_dates(self, dates, n_workers=1, chunk_size=None, hourly=False):
+        """
+        Calculate accurate astronomical features for all dates.
+        
+        With n_workers > 1 the dates are split into contiguous chunks computed by a
+        process pool (n_workers=None uses every CPU core). With hourly=True the dates
+        are local hours and features are calculated on that hourly grid (the daily
+        feature store is bypassed).
+        """
+        print(f"\n🌌 Calculating astronomical features for {len(dates)} {'hours' if hourly else 'dates'}...")
+        
+        if hourly:
+            astronomical_df = self.astronomical_calc.calculate_features_parallel(
+                dates, n_workers=n_workers, chunk_size=chunk_size, hourly=True)
+            print(f"✓ Calculated {len(astronomical_df.columns)-1} astronomical features")
+            return astronomical_df
+        
+        # One columnar batch over the whole date vector (naive dates are Chicago local time,
+        # aware dates are converted to Chicago time by the calculator). With a feature store
+        # only dates missing from the store are calculated.
+        if self.feature_store is not None:
+            astronomical_df = self.feature_store.get_features(dates, n_workers=n_workers,
+                                                              chunk_size=chunk_size)
+        else:
+            astronomical_df = self.astronomical_calc.calculate_features_parallel(
+                dates, n_workers=n_workers, chunk_size=chunk_size)
         print(f"✓ Calculated {len(astronomical_df.columns)-1} astronomical features")
         
         return astronomical_df
     
-    def perform_temporal_validation(self, daily_crime_df, astronomical_df):
+    def build_feature_matrices(self, astronomical_df, train_mask, test_mask, features, scale_features=True):
         """
-        Perform temporal validation with 2001-2024 training and 2025 testing.
+        Build the train and test feature matrices once for all FBI codes.
+        
+        Returns C-contiguous float32 (X_train, X_test) - the dtype the forest trains on,
+        so no per-model copies are made - and the StandardScaler fitted once on the
+        training rows (None with scale_features=False). Trees do not need scaling, but
+        split thresholds fall at slightly different float32 midpoints without it, so a
+        few test predictions can change; scaling keeps earlier results reproducible.
         """
-        print("\n🎯 Performing temporal validation...")
+        X_train = astronomical_df.loc[train_mask, features].to_numpy(dtype=np.float64)
+        X_test = astronomical_df.loc[test_mask, features].to_numpy(dtype=np.float64)
         
-        # Merge crime and astronomical data
-        combined_df = pd.merge(daily_crime_df, astronomical_df, on='date', how='inner')
-        combined_df = combined_df.sort_values('date')
+        scaler = None
+        if scale_features:
+            scaler = StandardScaler()
+            X_train = scaler.fit_transform(X_train)
+            X_test = scaler.transform(X_test)
         
-        print(f"✓ Combined dataset: {len(combined_df)} days")
+        return (np.ascontiguousarray(X_train, dtype=np.float32),
+                np.ascontiguousarray(X_test, dtype=np.float32), scaler)
+    
+    def build_binned_feature_matrix(self, astronomical_df, features, binner=None):
+        """
+        Bin the feature matrix of all rows once into uint8 codes for the histogram
+        gradient-boosting engine; every FBI code (and fold) slices the same matrix.
         
-        # Define training and testing periods
+        The bin edges are fitted on all rows unless a fitted binner is given: the
+        astronomical features are known in advance for every day and carry no target
+        information. Returns (binned matrix, binner).
+        """
+        X = astronomical_df[features].to_numpy(dtype=np.float64)
+        if binner is None:
+            binner = FeatureBinner().fit(X)
+        return binner.transform(X), binner
+    
+    def update_with_new_extract(self, extract_path, cube_dir=COUNT_CUBE_DIR, combined_dir=COMBINED_DATASET_DIR,
+                                date_format=CRIME_DATE_FORMAT, n_workers=1):
+        """
+        Incrementally fold a new crime extract into the persisted daily count cube.
+        
+        Records whose id was already ingested are skipped, only the affected days of the
+        cube change, astronomy is calculated only for days missing from the feature store,
+        and the affected days are added to (or replaced in) the combined dataset, whose
+        year files are rewritten only for the years containing affected days. A missing
+        dataset, or one calculated with another calculator, is rebuilt in full.
+        
+        Returns (updated count cube, combined rows for the affected days or None).
+        """
+        print(f"\n🔄 Incremental update from {extract_path}...")
+        
+        if self.feature_store is None:
+            raise ValueError("Incremental updates need the astronomical feature store")
+        
+        count_cube = DailyCountCube.load(cube_dir)
+        extract = pd.read_csv(extract_path, usecols=['date', 'fbi_code', RECORD_KEY_COLUMN],
+                              dtype={'date': str, 'fbi_code': 'category', RECORD_KEY_COLUMN: str})
+        dates = parse_crime_dates(extract['date'], date_format)
+        
+        count_cube, affected_dates, n_new = count_cube.add_records(dates, extract['fbi_code'],
+                                                                   extract[RECORD_KEY_COLUMN])
+        print(f"✓ {n_new:,} new of {len(extract):,} records, {len(affected_dates)} days affected")
+        if n_new == 0:
+            return count_cube, None
+        
+        count_cube.save(cube_dir)
+        
+        # The store only calculates astronomy for dates it has not seen
+        astronomical_df = self.feature_store.get_features(pd.DatetimeIndex(affected_dates), n_workers=n_workers)
+        new_rows = pd.merge(count_cube.to_frame(count_cube.date_positions(affected_dates)), astronomical_df,
+                            on='date', how='inner')
+        
+        if not self._combined_dataset_current(combined_dir):
+            # First update, or a dataset calculated with other astronomy: build the full
+            # dataset from the cube and the (cached) feature store
+            all_dates = pd.DatetimeIndex(count_cube.dates)
+            self.write_combined_dataset(count_cube, self.feature_store.get_features(all_dates, n_workers=n_workers),
+                                        combined_dir)
+            return count_cube, new_rows
+        
+        existing_years = set(combined_dataset_years(combined_dir))
+        for year, year_rows in new_rows.groupby(new_rows['date'].dt.year):
+            year_path = os.path.join(combined_dir, f'year={year}.csv')
+            if year in existing_years:
+                year_df = pd.read_csv(year_path, parse_dates=['date'], float_precision='round_trip')
+                year_df = year_df[~year_df['date'].isin(year_rows['date'])]
+                year_df = pd.concat([year_df, year_rows], ignore_index=True)
+                # FBI codes first seen in this extract have no crimes on earlier days
+                year_df[count_cube.codes] = year_df[count_cube.codes].fillna(0)
+                year_rows = year_df[new_rows.columns].sort_values('date', kind='stable')
+            _write_csv_atomic(year_rows, year_path)
+        
+        n_years = new_rows['date'].dt.year.nunique()
+        print(f"✓ Combined dataset: {len(new_rows)} days updated in {n_years} year files of {combined_dir}")
+        
+        return count_cube, new_rows
+    
+    def write_combined_dataset(self, count_cube, astronomical_df, combined_dir=COMBINED_DATASET_DIR):
+        """
+        Rewrite every year of the combined dataset from the count cube and its
+        astronomical features, removing year files of days no longer in the cube.
+        """
+        count_cube, astronomical_df, rows = self._align_with_cube(count_cube, astronomical_df)
+        combined_df = pd.merge(count_cube.to_frame(rows), astronomical_df, on='date', how='inner')
+        years = combined_df['date'].dt.year
+        
+        # The manifest is written last, so an interrupted rewrite is redone by the next update
+        manifest_path = os.path.join(combined_dir, COMBINED_MANIFEST_FILE)
+        os.makedirs(combined_dir, exist_ok=True)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        for year in set(combined_dataset_years(combined_dir)) - set(years):
+            os.remove(os.path.join(combined_dir, f'year={year}.csv'))
+        for year, year_df in combined_df.groupby(years):
+            _write_csv_atomic(year_df, os.path.join(combined_dir, f'year={year}.csv'))
+        
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump({'calculator_key': self.astronomical_calc.cache_key()}, f, indent=2)
+        os.replace(manifest_path + '.tmp', manifest_path)
+        print(f"✓ Combined dataset: {len(combined_df)} days in {years.nunique()} year files of {combined_dir}")
+    
+    def _combined_dataset_current(self, combined_dir):
+        """
+        Whether the combined dataset exists and was written with this analyzer's calculator.
+        """
+        manifest_path = os.path.join(combined_dir, COMBINED_MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return False
+        with open(manifest_path) as f:
+            return json.load(f)['calculator_key'] == self.astronomical_calc.cache_key()
+    
+    def _align_with_cube(self, count_cube, astronomical_df):
+        """
+        Sort the astronomical features by date and keep the days present in the count
+        cube (a daily pivot DataFrame is converted to a cube).
+        
+        Returns (count_cube, aligned astronomical_df, cube row of every feature row).
+        """
+        if not isinstance(count_cube, DailyCountCube):
+            count_cube = DailyCountCube.from_pivot(count_cube)
+        
+        astronomical_df = astronomical_df.sort_values('date', kind='stable')
+        rows = count_cube.date_positions(astronomical_df['date'])
+        astronomical_df = astronomical_df[rows >= 0].reset_index(drop=True)
+        return count_cube, astronomical_df, rows[rows >= 0]
+    
+    def _analysis_fbi_codes(self, count_cube):
+        """
+        FBI codes of the count cube that are analyzed, in cube order.
+        """
+        return [code for code in count_cube.codes if code.startswith('FBI_') or code in ANALYSIS_FBI_CODES]
+    
+    def _temporal_split(self, astronomical_df):
+        """
+        Training (2001-2024) and testing (2025) row masks.
+        """
         train_end = datetime(2024, 12, 31).date()
         test_start = datetime(2025, 1, 1).date()
         
-        train_data = combined_df[combined_df['date'].dt.date <= train_end]
-        test_data = combined_df[combined_df['date'].dt.date >= test_start]
+        train_mask = (astronomical_df['date'].dt.date <= train_end).to_numpy()
+        test_mask = (astronomical_df['date'].dt.date >= test_start).to_numpy()
+        return train_mask, test_mask
+    
+    def _engine_feature_matrices(self, engine, astronomical_df, train_mask, test_mask, features, scale_features):
+        """
+        (X_train, X_test, scaler, binner) for a model engine: uint8 bin codes for
+        hist_gradient_boosting, float32 (optionally scaled) features for random_forest.
+        """
+        if engine == 'hist_gradient_boosting':
+            binned, binner = self.build_binned_feature_matrix(astronomical_df, features)
+            print(f"✓ Binned features: {binned.nbytes / 1024 ** 2:.1f} MB uint8")
+            return (np.ascontiguousarray(binned[train_mask]), np.ascontiguousarray(binned[test_mask]),
+                    None, binner)
+        
+        X_train, X_test, scaler = self.build_feature_matrices(astronomical_df, train_mask, test_mask,
+                                                              features, scale_features)
+        return X_train, X_test, scaler, None
+    
+    def perform_temporal_validation(self, count_cube, astronomical_df, scale_features=True, n_jobs=1,
+                                    multi_output=False, class_weights=None, engine='random_forest',
+                                    permutation_repeats=0):
+        """
+        Perform temporal validation with 2001-2024 training and 2025 testing.
+        
+        count_cube is a DailyCountCube (a daily pivot DataFrame is converted); targets
+        are sliced straight from its integer counts. The feature matrices are built once
+        and shared by every per-code model (see build_feature_matrices).
+        
+        n_jobs is the total core budget (None = every core): per-code models train in
+        parallel worker processes that read the feature matrices from shared memory,
+        with leftover cores used inside each forest. Seeds are fixed, so results equal
+        the serial run.
+        
+        multi_output=True fits a single multi-output forest on every code's binary target
+        instead of one forest per code; each code then reports the shared forest's
+        feature importances. class_weights optionally maps FBI codes to {0: w0, 1: w1}
+        class weights (codes not listed use 'balanced') in either mode.
         
-        print(f"✓ Training period: {len(train_data)} days (2001-2024)")
-        print(f"✓ Testing period: {len(test_data)} days (2025)")
+        engine='hist_gradient_boosting' trains a HistGradientBoostingClassifier per code
+        on the uint8 bin codes from build_binned_feature_matrix instead of a forest;
+        it has no feature_importances_, so its importances are the mean permutation
+        importances on the 2025 test days, exported in the same schema.
         
-        # Get FBI codes (excluding date column)
-        fbi_codes = [col for col in combined_df.columns if col.startswith('FBI_') or col in [
-            '01A', '01B', '02', '03', '04A', '04B', '05', '06', '07', '08A', '08B', 
-            '09', '10', '11', '12', '13', '14', '15', '16', '17', '18', '19', '20', 
-            '22', '24', '26'
-        ]]
+        permutation_repeats > 0 also computes permutation importance on the 2025 test
+        days (see compute_permutation_importance), stored per code as
+        'permutation_importance': {feature: (mean, std)}.
+        
+        Returns {fbi_code: result dict}.
+        """
+        if engine not in MODEL_ENGINES:
+            raise ValueError(f"Unknown model engine {engine!r}; expected one of {MODEL_ENGINES}")
+        if multi_output and engine != 'random_forest':
+            raise ValueError("multi_output is only supported by the random_forest engine")
+        
+        print("\n🎯 Performing temporal validation...")
+        
+        count_cube, astronomical_df, rows = self._align_with_cube(count_cube, astronomical_df)
+        
+        print(f"✓ Combined dataset: {len(rows)} days")
+        
+        # Define training and testing periods
+        train_mask, test_mask = self._temporal_split(astronomical_df)
+        
+        print(f"✓ Training period: {train_mask.sum()} days (2001-2024)")
+        print(f"✓ Testing period: {test_mask.sum()} days (2025)")
+        
+        # Get FBI codes
+        fbi_codes = self._analysis_fbi_codes(count_cube)
         
         # Get astronomical feature columns
-        astronomical_features = [col for col in combined_df.columns if col not in fbi_codes + ['date']]
+        astronomical_features = [col for col in astronomical_df.columns if col != 'date']
         
         print(f"✓ FBI codes to analyze: {len(fbi_codes)}")
         print(f"✓ Astronomical features: {len(astronomical_features)}")
         print(f"✓ Including all minor planets/asteroids with proper Chicago timezone calculations")
         
-        # Prepare feature matrices
-        X_train = train_data[astronomical_features]
-        X_test = test_data[astronomical_features]
+        # Prepare feature matrices (shared by all FBI codes)
+        X_train, X_test, scaler, binner = self._engine_feature_matrices(
+            engine, astronomical_df, train_mask, test_mask, astronomical_features, scale_features)
         
-        results = {}
+        class_weights = class_weights or {}
+        tasks = []
         
         for fbi_code in fbi_codes:
-            if fbi_code not in train_data.columns:
-                continue
-                
             # Create binary classification targets (high crime days)
-            y_train = train_data[fbi_code]
-            y_test = test_data[fbi_code]
+            counts = count_cube.column(fbi_code)[rows]
+            y_train = counts[train_mask]
+            y_test = counts[test_mask]
             
             # Use 50th percentile as threshold for high crime days
-            threshold = np.percentile(y_train[y_train > 0], 50) if np.sum(y_train > 0) > 10 else 1
+            threshold = high_crime_threshold(y_train)
             
             y_train_binary = (y_train >= threshold).astype(int)
             y_test_binary = (y_test >= threshold).astype(int)
@@ -182,22 +729,24 @@ class EnhancedFBICrimeAnalysis:
             if np.sum(y_train_binary) < 10 or np.sum(y_test_binary) < 2:
                 continue
             
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-            
-            # Train Random Forest
-            model = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=10,
-                min_samples_split=10,
-                random_state=42,
-                class_weight='balanced'
-            )
-            
-            model.fit(X_train_scaled, y_train_binary)
-            y_pred = model.predict(X_test_scaled)
+            tasks.append({'fbi_code': fbi_code, 'threshold': threshold,
+                          'y_train': y_train_binary, 'y_test': y_test_binary,
+                          'class_weight': class_weights.get(fbi_code, 'balanced')})
+        
+        if multi_output and tasks:
+            # One forest over all codes, with every core building its trees
+            print(f"  Multi-output forest over {len(tasks)} FBI codes")
+            fitted = _fit_multi_output_model(X_train, X_test, tasks, plan_core_budget(1, n_jobs)[1])
+        else:
+            # Train the per-code models (in parallel under the core budget)
+            fit_function = _fit_code_boosting_model if engine == 'hist_gradient_boosting' else _fit_code_model
+            fitted = run_tasks(fit_function, tasks, {'X_train': X_train, 'X_test': X_test}, n_jobs)
+        
+        results = {}
+        
+        for k, (task, (model, y_pred)) in enumerate(zip(tasks, fitted)):
+            fbi_code, threshold = task['fbi_code'], task['threshold']
+            y_train_binary, y_test_binary = task['y_train'], task['y_test']
             
             # Calculate performance
             f1 = f1_score(y_test_binary, y_pred)
@@ -210,16 +759,309 @@ class EnhancedFBICrimeAnalysis:
                 'predictions': np.sum(y_pred),
                 'model': model,
                 'scaler': scaler,
-                'feature_importance': dict(zip(astronomical_features, model.feature_importances_))
+                'binner': binner,
+                'output': k if multi_output else None,  # output of a multi-output forest
+                'feature_importance': (dict(zip(astronomical_features, model.feature_importances_))
+                                       if hasattr(model, 'feature_importances_') else {})
             }
             
             print(f"  {fbi_code}: F1={f1:.3f}, Threshold={threshold:.1f}, Train+={np.sum(y_train_binary)}, Test+={np.sum(y_test_binary)}")
         
-        return results, combined_df
+        # Models without feature_importances_ report mean permutation importances instead
+        n_repeats = permutation_repeats or (PERMUTATION_IMPORTANCE_REPEATS
+                                            if any(not result['feature_importance'] for result in results.values())
+                                            else 0)
+        if n_repeats and results:
+            y_tests = {task['fbi_code']: task['y_test'] for task in tasks}
+            permutation = self.compute_permutation_importance(results, X_test, y_tests, astronomical_features,
+                                                              n_repeats, n_jobs)
+            for fbi_code, importance in permutation.items():
+                if permutation_repeats:
+                    results[fbi_code]['permutation_importance'] = importance
+                if not results[fbi_code]['feature_importance']:
+                    results[fbi_code]['feature_importance'] = {feature: mean for feature, (mean, _) in importance.items()}
+        
+        return results
+    
+    def compute_permutation_importance(self, results, X_test, y_tests, features, n_repeats=5, n_jobs=1, seed=42):
+        """
+        Permutation importance of every feature for every FBI code on the test matrix,
+        as the mean and standard deviation over n_repeats of the F1 drop.
+        
+        Work is split into (code, feature chunk) tasks for the core budget, with enough
+        chunks per code to keep every core busy; the test matrix is shared with the
+        workers and each task permutes columns in its own preallocated buffer.
+        
+        Returns {fbi_code: {feature: (mean, std)}}.
+        """
+        print(f"\n🔀 Permutation importance ({n_repeats} repeats, {len(features)} features)...")
+        
+        codes = list(results)
+        n_cores = n_jobs or os.cpu_count() or 1
+        n_chunks = min(len(features), max(1, -(-n_cores // len(codes))))
+        chunks = np.array_split(np.arange(len(features)), n_chunks)
+        
+        tasks = [{'model': results[fbi_code]['model'], 'output': results[fbi_code].get('output'),
+                  'y_test': y_tests[fbi_code], 'features': chunk, 'n_repeats': n_repeats,
+                  'seed': [seed, zlib.crc32(fbi_code.encode())]}
+                 for fbi_code in codes for chunk in chunks]
+        chunk_importances = run_tasks(_permutation_importance_task, tasks, {'X_test': X_test}, n_jobs)
+        
+        permutation = {}
+        for k, fbi_code in enumerate(codes):
+            importances = np.concatenate(chunk_importances[k * n_chunks:(k + 1) * n_chunks])
+            permutation[fbi_code] = {feature: (importances[j].mean(), importances[j].std())
+                                     for j, feature in enumerate(features)}
+        
+        return permutation
+    
+    def perform_walk_forward_validation(self, count_cube, astronomical_df, first_train_end_year=2010,
+                                        last_train_end_year=2024, n_jobs=1, class_weights=None,
+                                        engine='random_forest'):
+        """
+        Rolling-origin validation: for every Y from first_train_end_year to
+        last_train_end_year, train on all days up to year Y and test on year Y+1.
+        
+        The feature matrix is built once (binned once for hist_gradient_boosting, not
+        scaled for random_forest) and shared by all folds; each fold trains on a prefix
+        of it. Count targets are sliced once for all codes, and thresholds are computed
+        once per training prefix. Every (fold, FBI code) model is a task for the core
+        budget, largest folds first.
+        
+        Returns (per-fold DataFrame, per-code summary DataFrame).
+        """
+        if engine not in MODEL_ENGINES:
+            raise ValueError(f"Unknown model engine {engine!r}; expected one of {MODEL_ENGINES}")
+        
+        print("\n🎯 Performing walk-forward validation...")
+        
+        count_cube, astronomical_df, rows = self._align_with_cube(count_cube, astronomical_df)
+        fbi_codes = self._analysis_fbi_codes(count_cube)
+        astronomical_features = [col for col in astronomical_df.columns if col != 'date']
+        
+        # Shared feature matrix (rows sorted by date) and count targets for every code
+        if engine == 'hist_gradient_boosting':
+            X = self.build_binned_feature_matrix(astronomical_df, astronomical_features)[0]
+        else:
+            X = np.ascontiguousarray(astronomical_df[astronomical_features].to_numpy(dtype=np.float32))
+        counts = np.asarray(count_cube.counts[rows][:, [count_cube.code_index[code] for code in fbi_codes]])
+        years = astronomical_df['date'].dt.year.to_numpy()
+        
+        class_weights = class_weights or {}
+        thresholds = {}  # training prefix length -> threshold per code
+        folds = []
+        tasks = []
+        
+        for train_end_year in range(first_train_end_year, last_train_end_year + 1):
+            train_rows = int(np.searchsorted(years, train_end_year, side='right'))
+            test_rows = int(np.searchsorted(years, train_end_year + 1, side='right'))
+            if train_rows == 0 or test_rows == train_rows:
+                continue
+            
+            if train_rows not in thresholds:
+                thresholds[train_rows] = [high_crime_threshold(counts[:train_rows, k]) for k in range(len(fbi_codes))]
+            
+            for k, fbi_code in enumerate(fbi_codes):
+                threshold = thresholds[train_rows][k]
+                y = (counts[:test_rows, k] >= threshold).astype(np.int8)
+                y_train, y_test = y[:train_rows], y[train_rows:]
+                
+                # Skip if not enough positive cases
+                if np.sum(y_train) < 10 or np.sum(y_test) < 2:
+                    continue
+                
+                folds.append((fbi_code, train_end_year, threshold, y_test))
+                tasks.append({'engine': engine, 'train_rows': train_rows, 'test_rows': test_rows,
+                              'y_train': y_train, 'class_weight': class_weights.get(fbi_code, 'balanced')})
+        
+        print(f"✓ Folds: {first_train_end_year}-{last_train_end_year} train end years, "
+              f"{len(tasks)} (fold, FBI code) models")
+        
+        # Largest training prefixes first so the pool finishes evenly
+        order = sorted(range(len(tasks)), key=lambda i: -tasks[i]['train_rows'])
+        predictions = run_tasks(_fit_fold_model, [tasks[i] for i in order], {'X': X}, n_jobs)
+        y_preds = [None] * len(tasks)
+        for i, y_pred in zip(order, predictions):
+            y_preds[i] = y_pred
+        
+        fold_rows = []
+        for (fbi_code, train_end_year, threshold, y_test), task, y_pred in zip(folds, tasks, y_preds):
+            fold_rows.append({
+                'fbi_code': fbi_code,
+                'train_end_year': train_end_year,
+                'test_year': train_end_year + 1,
+                'f1_score': f1_score(y_test, y_pred),
+                'precision': precision_score(y_test, y_pred, zero_division=0),
+                'recall': recall_score(y_test, y_pred, zero_division=0),
+                'threshold': threshold,
+                'train_positive_cases': int(np.sum(task['y_train'])),
+                'test_positive_cases': int(np.sum(y_test)),
+                'predicted_positive': int(np.sum(y_pred)),
+                'true_positive_cases': int(np.sum((y_pred == 1) & (y_test == 1)))
+            })
+        
+        fold_df = pd.DataFrame(fold_rows)
+        summary_df = self.summarize_walk_forward_folds(fold_df)
+        
+        for _, row in summary_df.iterrows():
+            print(f"  {row['fbi_code']}: mean F1={row['mean_f1']:.3f} ± {row['std_f1']:.3f}, "
+                  f"pooled F1={row['pooled_f1']:.3f} over {row['folds']} folds")
+        
+        return fold_df, summary_df
+    
+    def summarize_walk_forward_folds(self, fold_df):
+        """
+        Aggregate per-fold metrics per FBI code: fold count, mean/std/min/max F1 and the
+        pooled F1 over all test days of all folds.
+        """
+        if fold_df.empty:
+            return pd.DataFrame(columns=['fbi_code', 'folds', 'mean_f1', 'std_f1', 'min_f1', 'max_f1',
+                                         'pooled_f1', 'test_positive_cases'])
+        
+        grouped = fold_df.groupby('fbi_code', sort=False)
+        summary_df = grouped['f1_score'].agg(folds='count', mean_f1='mean', std_f1='std',
+                                             min_f1='min', max_f1='max').reset_index()
+        totals = grouped[['true_positive_cases', 'predicted_positive', 'test_positive_cases']].sum().reset_index()
+        
+        # Pooled F1 = 2TP / (predicted positives + actual positives)
+        denominator = totals['predicted_positive'] + totals['test_positive_cases']
+        summary_df['pooled_f1'] = (2 * totals['true_positive_cases'] / denominator.where(denominator > 0)).fillna(0.0)
+        summary_df['test_positive_cases'] = totals['test_positive_cases']
+        summary_df['std_f1'] = summary_df['std_f1'].fillna(0.0)
+        return summary_df
+    
+    def perform_threshold_sweep(self, count_cube, astronomical_df, percentiles=(25, 50, 75),
+                                cutoffs=tuple(np.round(np.arange(0.05, 1.0, 0.05), 2)), n_jobs=1,
+                                class_weights=None, engine='random_forest', scale_features=True):
+        """
+        Sweep high-crime target percentiles and decision cutoffs on the 2025 test split.
+        
+        Each FBI code is fitted once per distinct target threshold (percentiles that give
+        the same threshold share a model), predict_proba is called once per model, and
+        precision/recall/F1 for all cutoffs come from one pass over the sorted
+        probabilities (see cutoff_metrics).
+        
+        Returns (grid DataFrame with one row per code, percentile and cutoff,
+        DataFrame of the best-F1 operating point per code).
+        """
+        if engine not in MODEL_ENGINES:
+            raise ValueError(f"Unknown model engine {engine!r}; expected one of {MODEL_ENGINES}")
+        
+        print("\n🎯 Performing threshold sweep...")
+        
+        count_cube, astronomical_df, rows = self._align_with_cube(count_cube, astronomical_df)
+        train_mask, test_mask = self._temporal_split(astronomical_df)
+        fbi_codes = self._analysis_fbi_codes(count_cube)
+        astronomical_features = [col for col in astronomical_df.columns if col != 'date']
+        
+        X_train, X_test, _, _ = self._engine_feature_matrices(
+            engine, astronomical_df, train_mask, test_mask, astronomical_features, scale_features)
+        
+        class_weights = class_weights or {}
+        targets = []  # (fbi_code, percentile, task index)
+        tasks = []
+        task_index = {}  # (fbi_code, threshold) -> task index
+        
+        for fbi_code in fbi_codes:
+            counts = count_cube.column(fbi_code)[rows]
+            y_train = counts[train_mask]
+            y_test = counts[test_mask]
+            
+            for percentile in percentiles:
+                threshold = high_crime_threshold(y_train, percentile)
+                y_train_binary = (y_train >= threshold).astype(int)
+                y_test_binary = (y_test >= threshold).astype(int)
+                
+                # Skip if not enough positive cases
+                if np.sum(y_train_binary) < 10 or np.sum(y_test_binary) < 2:
+                    continue
+                
+                if (fbi_code, threshold) not in task_index:
+                    task_index[fbi_code, threshold] = len(tasks)
+                    tasks.append({'engine': engine, 'threshold': threshold, 'y_train': y_train_binary,
+                                  'y_test': y_test_binary, 'class_weight': class_weights.get(fbi_code, 'balanced')})
+                targets.append((fbi_code, percentile, task_index[fbi_code, threshold]))
+        
+        print(f"✓ Percentiles: {list(percentiles)}, cutoffs: {len(cutoffs)}, "
+              f"{len(tasks)} models for {len(targets)} (FBI code, percentile) targets")
+        
+        probabilities = run_tasks(_fit_sweep_model, tasks, {'X_train': X_train, 'X_test': X_test}, n_jobs)
+        
+        grids = []
+        for fbi_code, percentile, i in targets:
+            task = tasks[i]
+            metrics = cutoff_metrics(task['y_test'], probabilities[i], cutoffs)
+            grids.append(pd.DataFrame({
+                'fbi_code': fbi_code,
+                'target_percentile': percentile,
+                'threshold': task['threshold'],
+                'cutoff': np.asarray(cutoffs, dtype=np.float64),
+                'f1_score': metrics['f1_score'],
+                'precision': metrics['precision'],
+                'recall': metrics['recall'],
+                'train_positive_cases': int(np.sum(task['y_train'])),
+                'test_positive_cases': int(np.sum(task['y_test'])),
+                'predicted_positive': metrics['predicted_positive']
+            }))
+        
+        grid_df = pd.concat(grids, ignore_index=True) if grids else pd.DataFrame()
+        best_df = (grid_df.loc[grid_df.groupby('fbi_code', sort=False)['f1_score'].idxmax()].reset_index(drop=True)
+                   if len(grid_df) else grid_df)
+        
+        for _, row in best_df.iterrows():
+            print(f"  {row['fbi_code']}: best F1={row['f1_score']:.3f} at P{row['target_percentile']} "
+                  f"(threshold {row['threshold']:.1f}), cutoff {row['cutoff']:.2f}")
+        
+        return grid_df, best_df
     
-    def export_results(self, results, combined_df):
+    def export_threshold_sweep(self, grid_df, best_df):
         """
-        Export analysis results and data.
+        Export the threshold sweep grid and the best operating point per code.
+        """
+        print("\n💾 Exporting threshold sweep...")
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        grid_file = f"threshold_sweep_grid_{timestamp}.csv"
+        grid_df.to_csv(grid_file, index=False)
+        print(f"✓ Sweep grid: {grid_file}")
+        
+        best_file = f"threshold_sweep_best_{timestamp}.csv"
+        best_df.to_csv(best_file, index=False)
+        print(f"✓ Best operating points: {best_file}")
+        
+        print(f"\n📈 THRESHOLD SWEEP SUMMARY:")
+        print(f"  Average best F1: {best_df['f1_score'].mean():.3f}")
+        print(f"  FBI codes analyzed: {len(best_df)}")
+        
+        return grid_file, best_file
+    
+    def export_walk_forward_results(self, fold_df, summary_df):
+        """
+        Export per-fold and per-code walk-forward validation results.
+        """
+        print("\n💾 Exporting walk-forward results...")
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        fold_file = f"walk_forward_fold_results_{timestamp}.csv"
+        fold_df.to_csv(fold_file, index=False)
+        print(f"✓ Per-fold results: {fold_file}")
+        
+        summary_file = f"walk_forward_summary_{timestamp}.csv"
+        summary_df.to_csv(summary_file, index=False)
+        print(f"✓ Per-code summary: {summary_file}")
+        
+        print(f"\n📈 WALK-FORWARD SUMMARY:")
+        print(f"  Average mean F1: {summary_df['mean_f1'].mean():.3f}")
+        print(f"  Average pooled F1: {summary_df['pooled_f1'].mean():.3f}")
+        print(f"  FBI codes analyzed: {len(summary_df)}, folds: {len(fold_df)}")
+        
+        return fold_file, summary_file
+    
+    def export_results(self, results, count_cube, astronomical_df):
+        """
+        Export analysis results and the combined crime + astronomy data.
         """
         print("\n💾 Exporting results...")
         
@@ -257,7 +1099,25 @@ class EnhancedFBICrimeAnalysis:
         importance_df.to_csv(importance_file, index=False)
         print(f"✓ Feature importance: {importance_file}")
         
-        # Export combined dataset
+        # Export permutation importance (when computed)
+        permutation_data = []
+        for fbi_code, result in results.items():
+            for feature, (importance, importance_std) in result.get('permutation_importance', {}).items():
+                permutation_data.append({
+                    'fbi_code': fbi_code,
+                    'feature': feature,
+                    'importance': importance,
+                    'importance_std': importance_std
+                })
+        
+        if permutation_data:
+            permutation_file = f"enhanced_permutation_importance_{timestamp}.csv"
+            pd.DataFrame(permutation_data).to_csv(permutation_file, index=False)
+            print(f"✓ Permutation importance: {permutation_file}")
+        
+        # Export combined dataset (the wide float64 pivot is only built for the CSV)
+        count_cube, astronomical_df, rows = self._align_with_cube(count_cube, astronomical_df)
+        combined_df = pd.merge(count_cube.to_frame(rows), astronomical_df, on='date', how='inner')
         combined_file = f"enhanced_combined_crime_astronomy_{timestamp}.csv"
         combined_df.to_csv(combined_file, index=False)
         print(f"✓ Combined dataset: {combined_file}")
@@ -279,28 +1139,99 @@ def main():
     """
     Main analysis function.
     """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--update', metavar='EXTRACT',
+                        help='fold a new crime extract into the persisted daily counts instead of a full run')
+    parser.add_argument('--no-record-keys', action='store_true',
+                        help='stream the crime CSV without keeping record id hashes (8 bytes per record); '
+                             'the saved counts then cannot take --update extracts')
+    parser.add_argument('--hourly', action='store_true',
+                        help='aggregate crimes per local hour and calculate astronomy on the hourly grid')
+    parser.add_argument('--multi-output', action='store_true',
+                        help='fit one multi-output forest across all FBI codes instead of one per code')
+    parser.add_argument('--engine', choices=MODEL_ENGINES, default='random_forest',
+                        help='per-code model engine')
+    parser.add_argument('--walk-forward', action='store_true',
+                        help='rolling-origin validation (train up to Y, test Y+1 for Y=2010-2024)')
+    parser.add_argument('--permutation-repeats', type=int, default=0, metavar='N',
+                        help='also compute permutation importance on the 2025 test days with N repeats')
+    parser.add_argument('--threshold-sweep', action='store_true',
+                        help='sweep target percentiles and decision cutoffs on the 2025 test split')
+    args = parser.parse_args()
+    
     print("🔍 Enhanced FBI Crime Analysis with Accurate Astronomy")
     print("=" * 60)
     
     analyzer = EnhancedFBICrimeAnalysis()
     
-    # Load and process data
-    crime_df = analyzer.load_and_process_crime_data()
-    if crime_df is None:
+    if args.update:
+        analyzer.update_with_new_extract(args.update, n_workers=None)
+        print("\n✅ Incremental update complete!")
+        return
+    
+    if args.hourly:
+        crime_df = analyzer.load_and_process_crime_data()
+        if crime_df is None:
+            return
+        count_cube = analyzer.aggregate_hourly_crime_data(crime_df)
+        del crime_df
+        
+        astronomical_df = analyzer.calculate_astronomical_features_for_dates(
+            pd.DatetimeIndex(count_cube.dates), n_workers=None, hourly=True)
+        results = analyzer.perform_temporal_validation(count_cube, astronomical_df, n_jobs=None,
+                                                       multi_output=args.multi_output, engine=args.engine,
+                                                       permutation_repeats=args.permutation_repeats)
+        analyzer.export_results(results, count_cube, astronomical_df)
+        
+        print("\n✅ Hourly analysis complete!")
+        return
+    
+    # Load from the year-partitioned crime store when it has been converted,
+    # otherwise stream the crime CSV straight into daily counts
+    if crime_store_years():
+        count_cube = analyzer.aggregate_daily_crime_data(analyzer.load_and_process_crime_data())
+    else:
+        count_cube = analyzer.stream_daily_crime_data(record_keys=not args.no_record_keys)
+    if count_cube is None:
         return
     
-    # Aggregate to daily data
-    daily_crime_df = analyzer.aggregate_daily_crime_data(crime_df)
+    # Persist the daily count cube and reopen it memory-mapped
+    count_cube.save(COUNT_CUBE_DIR)
+    count_cube = DailyCountCube.load(COUNT_CUBE_DIR)
     
     # Calculate astronomical features
-    unique_dates = pd.to_datetime(daily_crime_df['date']).dt.normalize().unique()
-    astronomical_df = analyzer.calculate_astronomical_features_for_dates(unique_dates)
+    unique_dates = pd.DatetimeIndex(count_cube.dates)
+    astronomical_df = analyzer.calculate_astronomical_features_for_dates(unique_dates, n_workers=None)
+    
+    # The new cube supersedes every year of the incrementally updated dataset
+    analyzer.write_combined_dataset(count_cube, astronomical_df)
+    
+    if args.walk_forward:
+        fold_df, summary_df = analyzer.perform_walk_forward_validation(count_cube, astronomical_df, n_jobs=None,
+                                                                       engine=args.engine)
+        analyzer.export_walk_forward_results(fold_df, summary_df)
+        print("\n✅ Walk-forward validation complete!")
+        return
+    
+    if args.threshold_sweep:
+        grid_df, best_df = analyzer.perform_threshold_sweep(count_cube, astronomical_df, n_jobs=None,
+                                                            engine=args.engine)
+        analyzer.export_threshold_sweep(grid_df, best_df)
+        print("\n✅ Threshold sweep complete!")
+        return
     
     # Perform temporal validation
-    results, combined_df = analyzer.perform_temporal_validation(daily_crime_df, astronomical_df)
+    results = analyzer.perform_temporal_validation(count_cube, astronomical_df, n_jobs=None,
+                                                   multi_output=args.multi_output, engine=args.engine,
+                                                   permutation_repeats=args.permutation_repeats)
     
     # Export results
-    performance_df, importance_df = analyzer.export_results(results, combined_df)
+    performance_df, importance_df = analyzer.export_results(results, count_cube, astronomical_df)
+    
+    # Persist the fitted models for crime_forecast.py
+    features = [col for col in astronomical_df.columns if col != 'date']
+    save_forecast_models(results, features, analyzer.astronomical_calc, MODEL_DIR, engine=args.engine)
+    print(f"✓ Forecast models: {MODEL_DIR}")
     
     print("\n✅ Enhanced analysis complete!")
     print("🌟 Now using accurate astronomical calculations with Chicago local time")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Chebyshev Ephemeris Tables
+==========================
+
+The slow outer bodies (Jupiter through Pluto) move smoothly over months, so their
+ecliptic longitudes can be replaced by piecewise Chebyshev polynomials fitted once,
+offline, against the calculator's own PyEphem pipeline (topocentric RA/Dec for the
+configured observer, converted to ecliptic longitude).
+
+Method:
+- The 1990-2040 range (plus a day of margin for next-day motion) is split into
+  fixed-length segments
+- In every segment each body's longitude is sampled at Chebyshev nodes, unwrapped
+  and fitted by least squares
+- Evaluation maps every instant to its segment and runs a vectorized Clenshaw
+  recurrence, so any number of instants costs a handful of array operations
+
+The residual is dominated by the daily topocentric parallax wobble, which a smooth
+polynomial cannot follow; verify_ephemeris_tables.py checks every day of the range
+against PyEphem and the bound is EPHEMERIS_TABLE_TOLERANCE_ARCSEC.
+
+Usage:
+    python ephemeris_tables.py           # build ephemeris_table_1990_2040.npz
+"""
+
+import hashlib
+import os
+import numpy as np
+from datetime import datetime
+
+# Years the table is guaranteed to cover
+EPHEMERIS_TABLE_START_YEAR = 1990
+EPHEMERIS_TABLE_END_YEAR = 2040
+
+EPHEMERIS_TABLE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    f'ephemeris_table_{EPHEMERIS_TABLE_START_YEAR}_{EPHEMERIS_TABLE_END_YEAR}.npz')
+
+TABLE_BODIES = ['jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+
+SEGMENT_DAYS = 32
+CHEBYSHEV_DEGREE = 8
+
+# Maximum error against PyEphem on every day of the range (see verify_ephemeris_tables.py)
+EPHEMERIS_TABLE_TOLERANCE_ARCSEC = 3.0
+
+
+class ChebyshevEphemerisTable:
+    """
+    Piecewise Chebyshev fits of ecliptic longitude for a fixed set of bodies and observer.
+    """
+    
+    def __init__(self, bodies, start, segment_days, coefficients, observer):
+        self.bodies = list(bodies)
+        self.start = float(start)  # PyEphem date of the first segment start
+        self.segment_days = float(segment_days)
+        # (bodies, segments, degree + 1) Chebyshev coefficients of the unwrapped longitude
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+        # (latitude, longitude, elevation) the table was fitted for
+        self.observer = tuple(str(value) for value in observer)
+        self.end = self.start + self.segment_days * self.coefficients.shape[1]
+    
+    def covers(self, instants):
+        """
+        True if every PyEphem instant lies inside the fitted range.
+        """
+        instants = np.asarray(instants, dtype=float)
+        return bool(len(instants) == 0 or (instants.min() >= self.start and instants.max() < self.end))
+    
+    def longitudes(self, instants, body_names=None):
+        """
+        Ecliptic longitudes (0-360 degrees) at PyEphem instants.
+        
+        Returns an (instants, bodies) array in body_names order (all table bodies by default).
+        """
+        instants = np.asarray(instants, dtype=float)
+        if not self.covers(instants):
+            raise ValueError("Instants fall outside the ephemeris table range")
+        body_idx = [self.bodies.index(name) for name in (body_names or self.bodies)]
+        
+        # Segment of every instant and its position mapped onto [-1, 1]
+        offsets = instants - self.start
+        segments = np.minimum((offsets // self.segment_days).astype(np.intp), self.coefficients.shape[1] - 1)
+        x = 2 * (offsets - segments * self.segment_days) / self.segment_days - 1
+        
+        # Clenshaw recurrence over (bodies, instants)
+        coefficients = self.coefficients[body_idx][:, segments, :]
+        b1 = np.zeros(coefficients.shape[:2])
+        b2 = np.zeros(coefficients.shape[:2])
+        for k in range(coefficients.shape[2] - 1, 0, -1):
+            b1, b2 = 2 * x * b1 - b2 + coefficients[:, :, k], b1
+        values = x * b1 - b2 + coefficients[:, :, 0]
+        
+        return (values % 360).T
+    
+    def fingerprint(self):
+        """
+        Hash of the fitted coefficients and fit configuration (part of the feature cache key).
+        """
+        digest = hashlib.sha256(self.coefficients.tobytes())
+        digest.update(repr((self.bodies, self.start, self.segment_days, self.observer)).encode())
+        return digest.hexdigest()
+    
+    def save(self, path=EPHEMERIS_TABLE_FILE):
+        """
+        Save the table as a compressed .npz file.
+        """
+        np.savez_compressed(path, bodies=np.array(self.bodies), start=self.start,
+                            segment_days=self.segment_days, coefficients=self.coefficients,
+                            observer=np.array(self.observer))
+    
+    @classmethod
+    def load(cls, path=EPHEMERIS_TABLE_FILE):
+        """
+        Load a table saved with save().
+        """
+        with np.load(path) as data:
+            return cls(data['bodies'].tolist(), data['start'], data['segment_days'],
+                       data['coefficients'], data['observer'].tolist())
+
+
+def build_ephemeris_table(calculator, start_year=EPHEMERIS_TABLE_START_YEAR, end_year=EPHEMERIS_TABLE_END_YEAR,
+                          bodies=TABLE_BODIES, segment_days=SEGMENT_DAYS, degree=CHEBYSHEV_DEGREE):
+    """
+    Fit Chebyshev tables to the calculator's PyEphem longitudes for the given years
+    (inclusive), with a day of margin on each side for next-day motion.
+    """
+    start = calculator._to_ephem_dates([datetime(start_year, 1, 1)])[0] - 1
+    end = calculator._to_ephem_dates([datetime(end_year + 1, 1, 1)])[0] + 2
+    n_segments = int(np.ceil((end - start) / segment_days))
+    
+    # Twice as many Chebyshev nodes as coefficients for a least-squares fit
+    n_nodes = 2 * (degree + 1)
+    nodes = np.cos(np.pi * (np.arange(n_nodes) + 0.5) / n_nodes)
+    segment_starts = start + segment_days * np.arange(n_segments)
+    instants = (segment_starts[:, None] + (nodes[None, :] + 1) / 2 * segment_days).ravel()
+    
+    sampled = calculator._sweep_positions(instants, list(bodies))['longitudes']
+    sampled = sampled.reshape(n_segments, n_nodes, len(bodies))
+    
+    # Unwrap along each segment so 360 -> 0 crossings do not break the fit
+    unwrapped = np.unwrap(np.radians(sampled), axis=1)
+    coefficients = np.empty((len(bodies), n_segments, degree + 1))
+    for j in range(len(bodies)):
+        fit = np.polynomial.chebyshev.chebfit(nodes, np.degrees(unwrapped[:, :, j]).T, degree)
+        coefficients[j] = fit.T
+    
+    return ChebyshevEphemerisTable(bodies, start, segment_days, coefficients,
+                                   (calculator.latitude, calculator.longitude, calculator.elevation))
+
+
+def load_ephemeris_table(calculator, path=EPHEMERIS_TABLE_FILE):
+    """
+    Load the cached ephemeris table, building and caching it first if it is missing.
+    
+    Raises ValueError if the cached table was fitted for a different observer.
+    """
+    if not os.path.exists(path):
+        build_ephemeris_table(calculator).save(path)
+    
+    table = ChebyshevEphemerisTable.load(path)
+    observer = tuple(str(value) for value in (calculator.latitude, calculator.longitude, calculator.elevation))
+    if table.observer != observer:
+        raise ValueError(f"Ephemeris table {path} was fitted for observer {table.observer}, not {observer}")
+    return table
+
+
+def main():
+    """
+    Rebuild the cached ephemeris table for the default observer.
+    """
+    from accurate_astronomical_calculator import AccurateAstronomicalCalculator
+    
+    print(f"🪐 Building Chebyshev ephemeris table {EPHEMERIS_TABLE_START_YEAR}-{EPHEMERIS_TABLE_END_YEAR}...")
+    table = build_ephemeris_table(AccurateAstronomicalCalculator())
+    table.save()
+    
+    print(f"✓ {len(table.bodies)} bodies, {table.coefficients.shape[1]} segments of {table.segment_days:g} days, "
+          f"degree {table.coefficients.shape[2] - 1}")
+    print(f"✓ Saved to {EPHEMERIS_TABLE_FILE} ({os.path.getsize(EPHEMERIS_TABLE_FILE) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Feature Binning
+===============
+
+Quantile binning of the astronomical feature matrix into uint8 bin codes, done once
+and shared by every FBI code model (and every validation fold) of the histogram
+gradient-boosting engine.
+
+With at most 255 bins per feature, HistGradientBoostingClassifier keeps every
+distinct code as its own bin, so its internal binning of the pre-binned matrix is
+lossless and cheap. The last bin is reserved for missing values, leaving 254 value
+bins: longitudes are bounded to 0-360°, so bins are ~1.4° wide at worst; features
+with fewer distinct values (signs, houses, aspects) keep them all.
+"""
+
+import numpy as np
+
+# Bins per feature (HistGradientBoostingClassifier's maximum)
+MAX_FEATURE_BINS = 255
+
+
+class FeatureBinner:
+    """
+    Per-feature bin edges mapping float features to uint8 bin codes.
+    """
+    
+    def __init__(self, max_bins=MAX_FEATURE_BINS):
+        if not 2 <= max_bins <= 256:
+            raise ValueError(f"max_bins must be between 2 and 256, got {max_bins}")
+        self.max_bins = max_bins  # the last bin is reserved for missing values
+        self.bin_edges = None  # one sorted array of inner edges per feature
+    
+    def fit(self, X):
+        """
+        Find the bin edges of every column: midpoints between distinct values when a
+        feature has at most max_bins - 1 of them, quantile edges otherwise (the last
+        bin is kept for missing values).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        value_bins = self.max_bins - 1
+        self.bin_edges = []
+        
+        for column in X.T:
+            values = np.unique(column[~np.isnan(column)])
+            if len(values) <= value_bins:
+                edges = (values[:-1] + values[1:]) / 2
+            else:
+                quantiles = np.linspace(0, 100, value_bins + 1)[1:-1]
+                edges = np.unique(np.percentile(column[~np.isnan(column)], quantiles, method='midpoint'))
+            self.bin_edges.append(edges)
+        
+        return self
+    
+    def transform(self, X):
+        """
+        Bin codes of X as a C-contiguous uint8 matrix; missing values go to the reserved
+        last bin, which no value shares.
+        """
+        if self.bin_edges is None:
+            raise ValueError("FeatureBinner must be fitted before transform")
+        
+        X = np.asarray(X, dtype=np.float64)
+        binned = np.empty(X.shape, dtype=np.uint8)
+        for j, edges in enumerate(self.bin_edges):
+            codes = np.searchsorted(edges, X[:, j], side='right')
+            codes[np.isnan(X[:, j])] = self.max_bins - 1
+            binned[:, j] = codes
+        
+        return binned
+    
+    def fit_transform(self, X):
+        """Fit the bin edges on X and return its uint8 bin codes."""
+        return self.fit(X).transform(X)
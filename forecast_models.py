@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Persisted Forecast Models
+=========================
+
+Saves the per-code models fitted by perform_temporal_validation so future dates can
+be scored without retraining, and loads them back for batch forecasts.
+
+Layout on disk (one directory):
+- manifest.json       - engine, feature order, FBI codes with their count thresholds
+                        and model files, and the calculator version and cache key the
+                        features were calculated with
+- preprocessor.joblib - the shared StandardScaler or FeatureBinner (if any)
+- model_<n>.joblib    - one fitted model per file (uncompressed, so its NumPy arrays
+                        can be memory-mapped on load)
+
+Forecasts are refused when the calculator's cache key differs from the manifest's:
+features calculated differently would be scored by models trained on others.
+"""
+
+import json
+import os
+from datetime import datetime
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from accurate_astronomical_calculator import CALCULATOR_VERSION
+
+MODEL_DIR = 'forecast_models'
+MANIFEST_FILE = 'manifest.json'
+PREPROCESSOR_FILE = 'preprocessor.joblib'
+
+# Largest batch scored with the compiled forests; beyond it the per-level gathers over
+# (rows x all trees) cost more than predict_proba's per-forest overhead
+COMPILED_FOREST_MAX_ROWS = 256
+
+
+def save_forecast_models(results, features, calculator, model_dir=MODEL_DIR, engine='random_forest'):
+    """
+    Persist the models in a perform_temporal_validation results dict together with a
+    manifest. Models shared by several codes (multi-output forests) are saved once.
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    
+    model_files = {}  # id(model) -> file name
+    codes = {}
+    preprocessor = None
+    
+    for fbi_code, result in results.items():
+        model = result['model']
+        if id(model) not in model_files:
+            model_files[id(model)] = f'model_{len(model_files):03d}.joblib'
+            _dump_atomic(model, os.path.join(model_dir, model_files[id(model)]))
+        
+        codes[fbi_code] = {
+            'model_file': model_files[id(model)],
+            'output': result.get('output'),
+            'threshold': float(result['threshold']),
+            'f1_score': float(result['f1_score']),
+        }
+        preprocessor = result.get('binner') or result.get('scaler') or preprocessor
+    
+    if preprocessor is not None:
+        _dump_atomic(preprocessor, os.path.join(model_dir, PREPROCESSOR_FILE))
+    elif os.path.exists(os.path.join(model_dir, PREPROCESSOR_FILE)):
+        os.remove(os.path.join(model_dir, PREPROCESSOR_FILE))  # Stale preprocessor
+    
+    # Remove model files of a previous, larger model set
+    for name in os.listdir(model_dir):
+        if name.startswith('model_') and name.endswith('.joblib') and name not in model_files.values():
+            os.remove(os.path.join(model_dir, name))
+    
+    manifest = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'engine': engine,
+        'features': list(features),
+        'codes': codes,
+        'preprocessor': PREPROCESSOR_FILE if preprocessor is not None else None,
+        'calculator_version': CALCULATOR_VERSION,
+        'calculator_key': calculator.cache_key(),
+        'feature_groups': calculator.feature_groups,
+        'ephemeris_table': calculator.ephemeris_table is not None,
+    }
+    manifest_path = os.path.join(model_dir, MANIFEST_FILE)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    
+    return manifest
+
+
+def _dump_atomic(obj, path):
+    """Write a joblib file via a temporary file so a crash never leaves a partial model."""
+    joblib.dump(obj, path + '.tmp')
+    os.replace(path + '.tmp', path)
+
+
+class CompiledForests:
+    """
+    Random forests flattened into one node table so every tree of every forest is
+    traversed at once with NumPy (one gather per tree level) instead of one
+    predict_proba call per forest - the per-call overhead dominates small batches.
+    
+    Probabilities equal RandomForestClassifier.predict_proba: per-tree class
+    fractions summed in tree order, then divided by the number of trees.
+    """
+    
+    def __init__(self, forests):
+        features, thresholds, left, right, roots = [], [], [], [], []
+        self.tree_ranges = {}  # forest name -> (first tree, end tree)
+        self.leaf_values = {}  # forest name -> (nodes of the table, outputs) class-1 fractions
+        self.node_offsets = {}  # forest name -> first node of the forest in the table
+        n_nodes = 0
+        
+        for name, forest in forests.items():
+            self.tree_ranges[name] = (len(roots), len(roots) + len(forest.estimators_))
+            self.node_offsets[name] = n_nodes
+            classes = forest.classes_ if forest.n_outputs_ > 1 else [forest.classes_]
+            values = []
+            
+            for estimator in forest.estimators_:
+                tree = estimator.tree_
+                is_leaf = tree.children_left == -1
+                node_ids = np.arange(tree.node_count) + n_nodes
+                
+                roots.append(n_nodes)
+                features.append(np.where(is_leaf, 0, tree.feature))
+                thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+                left.append(np.where(is_leaf, node_ids, tree.children_left + n_nodes))  # leaves loop on themselves
+                right.append(np.where(is_leaf, node_ids, tree.children_right + n_nodes))
+                
+                value = np.asarray(tree.value, dtype=np.float64)
+                fractions = np.zeros((tree.node_count, len(classes)))
+                for output, output_classes in enumerate(classes):
+                    output_value = value[:, output, :len(output_classes)]
+                    normalizer = output_value.sum(axis=1)
+                    normalizer[normalizer == 0.0] = 1.0
+                    if 1 in output_classes:
+                        fractions[:, output] = output_value[:, list(output_classes).index(1)] / normalizer
+                values.append(fractions)
+                n_nodes += tree.node_count
+            
+            self.leaf_values[name] = np.concatenate(values)
+        
+        self.features = np.concatenate(features)
+        self.thresholds = np.concatenate(thresholds)
+        self.left = np.concatenate(left)
+        self.right = np.concatenate(right)
+        self.roots = np.asarray(roots)
+        self.max_depth = max(estimator.tree_.max_depth for forest in forests.values()
+                             for estimator in forest.estimators_)
+    
+    def leaves(self, X):
+        """
+        Leaf node (table index) reached by every row in every tree: (rows, trees).
+        """
+        X = np.asarray(X, dtype=np.float32)  # Trees compare float32 features, as in scikit-learn
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.features[nodes]] <= self.thresholds[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+    
+    def probabilities(self, leaves, name, output=0):
+        """
+        Class-1 probabilities of one forest (and output) from the leaves of all rows.
+        """
+        first, end = self.tree_ranges[name]
+        fractions = self.leaf_values[name][leaves[:, first:end] - self.node_offsets[name], output]
+        return np.cumsum(fractions, axis=1)[:, -1] / (end - first)  # sequential sum in tree order
+
+
+class ForecastModels:
+    """
+    Persisted per-code models that score astronomical features for any dates.
+    """
+    
+    def __init__(self, manifest, models, preprocessor=None):
+        self.manifest = manifest
+        self.models = models  # model file -> fitted model
+        self.preprocessor = preprocessor
+        self.features = manifest['features']
+        self.codes = list(manifest['codes'])
+        self.compiled = None
+    
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR, mmap_mode='r'):
+        """
+        Load a saved model set, memory-mapping model arrays by default.
+        """
+        with open(os.path.join(model_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        
+        model_files = sorted({code['model_file'] for code in manifest['codes'].values()})
+        models = {name: joblib.load(os.path.join(model_dir, name), mmap_mode=mmap_mode) for name in model_files}
+        preprocessor = (joblib.load(os.path.join(model_dir, manifest['preprocessor']))
+                        if manifest['preprocessor'] else None)
+        return cls(manifest, models, preprocessor)
+    
+    def compile(self):
+        """
+        Flatten the random forests for low-latency scoring of small batches (see
+        CompiledForests); larger batches keep using predict_proba.
+        """
+        forests = {name: model for name, model in self.models.items() if isinstance(model, RandomForestClassifier)}
+        self.compiled = CompiledForests(forests) if forests else None
+        return self
+    
+    def check_calculator(self, calculator):
+        """
+        Raise ValueError unless the calculator produces the features the models were trained on.
+        """
+        if calculator.cache_key() != self.manifest['calculator_key']:
+            raise ValueError(f"Astronomical calculator does not match the models' manifest "
+                             f"(trained with calculator {self.manifest['calculator_version']}, "
+                             f"feature groups {self.manifest['feature_groups']})")
+    
+    def feature_matrix(self, astronomical_df):
+        """
+        Model input for astronomical features: manifest feature order, then scaled
+        (float32) or binned (uint8) like the training matrix.
+        """
+        missing = [feature for feature in self.features if feature not in astronomical_df.columns]
+        if missing:
+            raise ValueError(f"Astronomical features missing for forecast: {missing[:5]}")
+        
+        return self.prepare(astronomical_df[self.features].to_numpy(dtype=np.float64))
+    
+    def prepare(self, X):
+        """
+        Scale or bin a raw float64 feature matrix (columns in manifest feature order).
+        """
+        if self.preprocessor is not None:
+            X = self.preprocessor.transform(X)
+        return np.ascontiguousarray(X if X.dtype == np.uint8 else X.astype(np.float32))
+    
+    def probabilities(self, X):
+        """
+        High crime day probabilities (rows x FBI codes, in self.codes order) for a
+        prepared feature matrix.
+        """
+        use_compiled = self.compiled is not None and len(X) <= COMPILED_FOREST_MAX_ROWS
+        compiled = self.compiled.tree_ranges if use_compiled else {}
+        leaves = self.compiled.leaves(X) if compiled else None
+        
+        # Multi-output forests are evaluated once for all of their codes
+        model_probabilities = {name: model.predict_proba(X) for name, model in self.models.items()
+                               if name not in compiled}
+        
+        probabilities = np.zeros((len(X), len(self.codes)))
+        for k, fbi_code in enumerate(self.codes):
+            code = self.manifest['codes'][fbi_code]
+            if code['model_file'] in compiled:
+                probabilities[:, k] = self.compiled.probabilities(leaves, code['model_file'], code['output'] or 0)
+                continue
+            
+            proba = model_probabilities[code['model_file']]
+            classes = self.models[code['model_file']].classes_
+            if code['output'] is not None:
+                proba, classes = proba[code['output']], classes[code['output']]
+            
+            if 1 in classes:
+                probabilities[:, k] = proba[:, list(classes).index(1)]
+        
+        return probabilities
+    
+    def predict(self, astronomical_df):
+        """
+        Score every FBI code for every row of astronomical_df in one pass over a single
+        feature matrix.
+        
+        Returns a long DataFrame: date, fbi_code, threshold (daily count defining a high
+        crime day), probability of a high crime day and the predicted high_crime flag.
+        """
+        probabilities = self.probabilities(self.feature_matrix(astronomical_df))
+        dates = pd.DatetimeIndex(astronomical_df['date'])
+        
+        forecasts = []
+        for k, fbi_code in enumerate(self.codes):
+            forecasts.append(pd.DataFrame({
+                'date': dates,
+                'fbi_code': fbi_code,
+                'threshold': self.manifest['codes'][fbi_code]['threshold'],
+                'probability': probabilities[:, k],
+                'high_crime': (probabilities[:, k] > 0.5).astype(int)
+            }))
+        
+        return pd.concat(forecasts, ignore_index=True)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Scoring Service Load Test
+=========================
+
+Sends single-date /predict requests to a running scoring_service.py from many
+concurrent keep-alive connections and reports latency percentiles and throughput.
+
+Usage:
+    python load_test_scoring_service.py                              # 2,000 requests, 32 connections
+    python load_test_scoring_service.py --requests 10000 --concurrency 64 --start 2026-01-01 --end 2026-12-31
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import numpy as np
+import pandas as pd
+from scoring_service import SERVICE_HOST, SERVICE_PORT
+
+
+async def _client(host, port, dates, latencies, errors):
+    """One keep-alive connection sending its share of requests in sequence."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for date in dates:
+            started = time.perf_counter()
+            writer.write(f"GET /predict?date={date} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+            
+            status = (await reader.readline()).split()[1]
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            body = json.loads(await reader.readexactly(length))
+            
+            latencies.append(time.perf_counter() - started)
+            if status != b'200' or 'forecasts' not in body:
+                errors.append(body)
+    finally:
+        writer.close()
+
+
+async def load_test(host, port, n_requests, concurrency, start, end, seed=0):
+    """Run the load test and return (latencies in seconds, errors, elapsed seconds)."""
+    days = [str(day.date()) for day in pd.date_range(start, end, freq='D')]
+    rng = random.Random(seed)
+    requests = [rng.choice(days) for _ in range(n_requests)]
+    
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, requests[k::concurrency], latencies, errors)
+                           for k in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def main():
+    """Run the load test against a running scoring service."""
+    parser = argparse.ArgumentParser(description="Load test the crime risk scoring service")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--start', default='2025-01-01')
+    parser.add_argument('--end', default='2025-12-31')
+    args = parser.parse_args()
+    
+    print("⏱️  Load Testing Scoring Service")
+    print("=" * 50)
+    
+    latencies, errors, elapsed = asyncio.run(load_test(args.host, args.port, args.requests, args.concurrency,
+                                                       args.start, args.end))
+    latencies_ms = np.array(latencies) * 1000
+    
+    print(f"Requests: {len(latencies):,} ({len(errors)} errors) over {args.concurrency} connections")
+    print(f"Dates: {args.start} to {args.end}")
+    print(f"Latency: p50 {np.percentile(latencies_ms, 50):.1f} ms, p99 {np.percentile(latencies_ms, 99):.1f} ms, "
+          f"max {latencies_ms.max():.1f} ms")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} requests/s ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
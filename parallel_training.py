@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Parallel Per-Code Model Training
+================================
+
+Runs one training task per FBI code in a process pool under a total core budget.
+
+- Code-level parallelism first: up to one worker process per task
+- Leftover cores go to tree-level parallelism inside each model (n_jobs per task)
+- Feature matrices are placed in shared memory once and attached by every worker,
+  so they are never pickled per task; only the small per-code targets travel
+
+Task functions must be module-level (picklable) with the signature
+task_function(arrays, task, n_jobs) -> result, where arrays maps names to the shared
+NumPy arrays. With fixed seeds the results equal a serial run, whatever the budget.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+
+def plan_core_budget(n_tasks, n_cores=None):
+    """
+    Split a core budget (None = every core) into (task workers, n_jobs per task).
+    """
+    n_cores = max(1, n_cores or os.cpu_count() or 1)
+    n_workers = max(1, min(n_cores, n_tasks))
+    return n_workers, max(1, n_cores // n_workers)
+
+
+class SharedArrays:
+    """
+    Context manager that copies named NumPy arrays into shared memory blocks.
+    
+    specs describes the blocks for _init_training_worker in worker processes; the
+    blocks are released when the context exits.
+    """
+    
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.blocks = []
+        self.specs = {}
+    
+    def __enter__(self):
+        for name, array in self.arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            self.blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+        return self
+    
+    def __exit__(self, *exc_info):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+# Shared arrays and their memory blocks in a training worker (set by _init_training_worker)
+_worker_arrays = None
+_worker_blocks = None
+
+
+def _init_training_worker(specs):
+    """Process-pool initializer: attach the shared feature matrices once per worker."""
+    global _worker_arrays, _worker_blocks
+    _worker_blocks, _worker_arrays = [], {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        _worker_arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _run_training_task(task_function, task, n_jobs):
+    """Run one task in a worker process against the shared arrays."""
+    return task_function(_worker_arrays, task, n_jobs)
+
+
+def run_tasks(task_function, tasks, arrays, n_cores=1):
+    """
+    Run task_function(arrays, task, n_jobs) for every task under a core budget.
+    
+    Returns the results in task order. A budget of one core (or a single task) runs
+    in-process on the arrays themselves.
+    """
+    n_workers, n_jobs = plan_core_budget(len(tasks), n_cores)
+    
+    if n_workers <= 1:
+        return [task_function(arrays, task, n_jobs) for task in tasks]
+    
+    print(f"  Parallel training: {len(tasks)} tasks on {n_workers} workers x {n_jobs} jobs")
+    
+    with SharedArrays(arrays) as shared:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_training_worker,
+                                 initargs=(shared.specs,)) as executor:
+            futures = [executor.submit(_run_training_task, task_function, task, n_jobs) for task in tasks]
+            return [future.result() for future in futures]
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Crime Risk Scoring Service
+==========================
+
+Long-lived asyncio HTTP/JSON service answering "what is the risk profile for date D
+across all FBI codes" from the models persisted by enhanced_accurate_fbi_analysis.py.
+
+- The calculator, the persisted models and an in-memory feature cache stay resident
+- Features for dates not yet cached are looked up in (or added to) the feature store
+- Concurrent requests are micro-batched: requests arriving while a batch is scored
+  (or within the batch window) are scored together in one vectorized prediction
+- Random forests are compiled into one node table (CompiledForests), so a batch walks
+  every tree of every FBI code at once instead of calling predict_proba per code
+
+Endpoints (localhost only by default):
+    GET /predict?date=2026-01-01   -> {"date": ..., "forecasts": [{"fbi_code", "probability",
+                                                                  "high_crime", "threshold"}, ...]}
+    GET /health                    -> {"status": "ok", "codes": ..., "cached_dates": ...}
+
+Usage:
+    python scoring_service.py                        # http://127.0.0.1:8765
+    python scoring_service.py --port 9000 --model-dir forecast_models
+"""
+
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+import pandas as pd
+from enhanced_accurate_fbi_analysis import EnhancedFBICrimeAnalysis
+from forecast_models import MODEL_DIR, ForecastModels
+
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error'}
+
+
+class ScoringService:
+    """
+    Resident models and feature cache behind a micro-batching request queue.
+    """
+    
+    def __init__(self, model_dir=MODEL_DIR, feature_store_dir='astronomical_feature_store',
+                 batch_window=0.002, max_batch=512):
+        self.models = ForecastModels.load(model_dir, mmap_mode=None).compile()
+        manifest = self.models.manifest
+        self.analyzer = EnhancedFBICrimeAnalysis(feature_store_dir=feature_store_dir,
+                                                 feature_groups=manifest['feature_groups'],
+                                                 ephemeris_table=manifest['ephemeris_table'] or None)
+        self.models.check_calculator(self.analyzer.astronomical_calc)
+        
+        # Models predict sequentially: batching, not per-request threads, gives the throughput
+        for model in self.models.models.values():
+            if hasattr(model, 'n_jobs'):
+                model.n_jobs = 1
+        
+        self.thresholds = [self.models.manifest['codes'][code]['threshold'] for code in self.models.codes]
+        self.feature_cache = {}  # datetime64[D] -> raw float64 feature row (manifest order)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.queue = None
+    
+    def _features(self, days):
+        """
+        Raw feature rows for the requested days, calculating uncached days in one batch.
+        
+        The feature store and calculator are used directly (not through the analyzer)
+        so requests do not print batch-run progress.
+        """
+        missing = sorted({day for day in days if day not in self.feature_cache})
+        if missing:
+            store = self.analyzer.feature_store
+            cached_df, uncalculated = (store.lookup(pd.DatetimeIndex(missing)) if store is not None
+                                       else (None, pd.DatetimeIndex(missing)))
+            frames = [cached_df] if cached_df is not None and len(cached_df) else []
+            if len(uncalculated):
+                new_df = self.analyzer.astronomical_calc.calculate_features_batch(uncalculated)
+                if store is not None:
+                    store.append(new_df)
+                frames.append(new_df)
+            
+            astronomical_df = pd.concat(frames, ignore_index=True)
+            rows = astronomical_df[self.models.features].to_numpy(dtype=np.float64)
+            for date, row in zip(astronomical_df['date'].values.astype('datetime64[D]'), rows):
+                self.feature_cache[date] = row
+        return np.vstack([self.feature_cache[day] for day in days])
+    
+    def score(self, days):
+        """
+        Probability matrix (days x FBI codes) for unique datetime64[D] days.
+        """
+        return self.models.probabilities(self.models.prepare(self._features(days)))
+    
+    def score_profiles(self, days):
+        """
+        Risk profile of every day (or the exception raised scoring it). When a batch
+        fails, its days are scored one by one so that one unscorable day (e.g. outside
+        the eclipse catalog) does not fail the others.
+        """
+        try:
+            probabilities = self.score(days)
+        except Exception as error:
+            if len(days) == 1:
+                return {days[0]: error}
+            profiles = {}
+            for day in days:
+                profiles.update(self.score_profiles([day]))
+            return profiles
+        
+        return {day: self.forecast(day, probabilities[k]) for k, day in enumerate(days)}
+    
+    def forecast(self, day, probabilities):
+        """JSON-ready risk profile of one day."""
+        return {
+            'date': str(day),
+            'forecasts': [
+                {'fbi_code': code, 'probability': round(float(probability), 6),
+                 'high_crime': int(probability > 0.5), 'threshold': threshold}
+                for code, probability, threshold in zip(self.models.codes, probabilities, self.thresholds)
+            ]
+        }
+    
+    async def predict(self, day):
+        """Queue one day for the next batch and wait for its risk profile."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((day, future))
+        return await future
+    
+    async def run_batches(self):
+        """
+        Collect queued requests into batches and score each batch in a worker thread,
+        so the event loop keeps accepting requests meanwhile.
+        """
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                try:
+                    batch.append(self.queue.get_nowait() if timeout <= 0 else
+                                 await asyncio.wait_for(self.queue.get(), timeout))
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+            
+            days = sorted({day for day, _ in batch})
+            try:
+                profiles = await loop.run_in_executor(None, self.score_profiles, days)
+            except Exception as error:
+                profiles = dict.fromkeys(days, error)
+            
+            for day, future in batch:
+                if future.done():
+                    continue
+                if isinstance(profiles[day], Exception):
+                    future.set_exception(profiles[day])
+                else:
+                    future.set_result(profiles[day])
+    
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests (keep-alive) on one connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                content_length = headers.get('content-length', '') or '0'
+                if not content_length.isdigit():
+                    # The body cannot be skipped, so the connection cannot be reused
+                    await self.respond(writer, 400, {'error': f'invalid Content-Length: {content_length!r}'},
+                                       keep_alive=False)
+                    break
+                if int(content_length):
+                    await reader.readexactly(int(content_length))
+                
+                status, body = await self.route(request_line.decode('latin-1').split())
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def respond(self, writer, status, body, keep_alive=True):
+        """Write one JSON response."""
+        payload = json.dumps(body).encode()
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+        await writer.drain()
+    
+    async def route(self, request):
+        """Dispatch a parsed request line to (status, JSON body)."""
+        if len(request) < 2:
+            return 400, {'error': 'malformed request line'}
+        method, target = request[0], urlsplit(request[1])
+        if method != 'GET':
+            return 405, {'error': f'{method} not allowed'}
+        
+        if target.path == '/health':
+            return 200, {'status': 'ok', 'codes': len(self.models.codes),
+                         'cached_dates': len(self.feature_cache)}
+        
+        if target.path == '/predict':
+            date = parse_qs(target.query).get('date', [None])[0]
+            try:
+                day = np.datetime64(pd.Timestamp(date).date(), 'D')
+            except (TypeError, ValueError):
+                return 400, {'error': f'invalid or missing date: {date!r}'}
+            try:
+                return 200, await self.predict(day)
+            except ValueError as error:
+                # Dates the features cannot be calculated for (e.g. outside the eclipse catalog)
+                return 400, {'error': str(error)}
+            except Exception as error:
+                return 500, {'error': str(error)}
+        
+        return 404, {'error': f'unknown path {target.path}'}
+    
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT):
+        """Run the HTTP server and the batcher until cancelled."""
+        self.queue = asyncio.Queue()
+        batcher = asyncio.create_task(self.run_batches())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        
+        print(f"🛰️  Scoring {len(self.models.codes)} FBI codes on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+
+def main():
+    """Start the scoring service."""
+    parser = argparse.ArgumentParser(description="Serve all-code crime risk profiles over HTTP/JSON")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    parser.add_argument('--feature-store', default='astronomical_feature_store')
+    parser.add_argument('--batch-window-ms', type=float, default=2.0,
+                        help='time to wait for more requests before scoring a batch')
+    parser.add_argument('--max-batch', type=int, default=512)
+    args = parser.parse_args()
+    
+    service = ScoringService(args.model_dir, args.feature_store, args.batch_window_ms / 1000, args.max_batch)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n✓ Scoring service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Analysis Pipeline Verification Script
+=====================================
+
+Checks that the optimized analysis building blocks agree with the reference
+behaviour they replace, on small synthetic data.
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+from enhanced_accurate_fbi_analysis import EnhancedFBICrimeAnalysis, cutoff_metrics
+from feature_binning import FeatureBinner
+
+
+def _synthetic_crimes(rng, first_id, n_records):
+    """Random crime records (id, date, fbi_code) in 2024-2025."""
+    return pd.DataFrame({
+        'id': np.arange(first_id, first_id + n_records).astype(str),
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 730 * 24, n_records), unit='h'),
+        'fbi_code': pd.Categorical(rng.choice(['01A', '06', '08B'], n_records)),
+    })
+
+
+def verify_incremental_update():
+    """Verify an extract folded in with add_records counts like a full rebuild."""
+    print("🔄 Verifying Incremental Count Updates")
+    print("=" * 50)
+    
+    rng = np.random.default_rng(0)
+    history = _synthetic_crimes(rng, 0, 5000)
+    extract = _synthetic_crimes(rng, 4900, 300)  # 100 ids already ingested
+    
+    # Invalid records are ignored by both paths: a missing FBI code and a missing date
+    extract['fbi_code'] = extract['fbi_code'].cat.add_categories(['26'])
+    extract.loc[297, 'fbi_code'] = np.nan
+    extract.loc[298, 'date'] = pd.NaT
+    extract.loc[299, 'fbi_code'] = '26'
+    extract.loc[299, 'date'] = pd.Timestamp('2026-01-05 10:00')  # new code on a new day
+    
+    analyzer = EnhancedFBICrimeAnalysis(feature_store_dir=None)
+    full_history = pd.concat([history, extract[~extract['id'].isin(history['id'])]], ignore_index=True)
+    rebuilt = analyzer.aggregate_daily_crime_data(full_history)
+    updated, _, n_new = analyzer.aggregate_daily_crime_data(history).add_records(
+        extract['date'], extract['fbi_code'], extract['id'])
+    
+    same_codes = updated.codes == rebuilt.codes
+    same_dates = np.array_equal(updated.dates, rebuilt.dates)
+    same_counts = same_codes and same_dates and np.array_equal(updated.counts, rebuilt.counts)
+    same_keys = np.array_equal(updated.record_keys, rebuilt.record_keys)
+    
+    print(f"\n✅ New records counted: {n_new} (of {len(extract)})")
+    print(f"✅ FBI codes match rebuild: {same_codes} ({updated.codes})")
+    print(f"✅ Days match rebuild: {same_dates}")
+    print(f"✅ Counts match rebuild: {same_counts}")
+    print(f"✅ Record keys match rebuild: {same_keys}")
+    
+    return n_new == 198 and same_counts and same_keys
+
+
+def verify_cutoff_metrics():
+    """Verify the threshold sweep's 0.5 cutoff predicts exactly like model.predict."""
+    print("🎚️  Verifying Threshold Sweep Cutoffs")
+    print("=" * 50)
+    
+    # Two-tree forests give probabilities of 0, 0.5 and 1, so many days tie at 0.5
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 5))
+    y = (X[:, 0] + rng.normal(size=400) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=2, random_state=0).fit(X[:300], y[:300])
+    probabilities = model.predict_proba(X[300:])[:, 1]
+    y_pred = model.predict(X[300:])
+    
+    metrics = cutoff_metrics(y[300:], probabilities, [0.5])
+    ties = int(np.sum(probabilities == 0.5))
+    same_positives = metrics['predicted_positive'][0] == y_pred.sum()
+    same_f1 = np.isclose(metrics['f1_score'][0], f1_score(y[300:], y_pred))
+    
+    print(f"✅ Days tied at the cutoff: {ties}")
+    print(f"✅ Predicted positives match predict(): {same_positives} "
+          f"({metrics['predicted_positive'][0]} vs {y_pred.sum()})")
+    print(f"✅ F1 matches predict(): {same_f1}")
+    
+    return ties > 0 and same_positives and same_f1
+
+
+def verify_feature_binning_missing_values():
+    """Verify missing values get a bin of their own, apart from the largest values."""
+    print("🗃️  Verifying Feature Binning of Missing Values")
+    print("=" * 50)
+    
+    rng = np.random.default_rng(0)
+    X = np.column_stack([
+        rng.uniform(0, 360, size=2000),       # more distinct values than bins (quantile edges)
+        rng.integers(0, 12, size=2000) * 30.0,  # few distinct values (midpoint edges)
+    ])
+    X[::50] = np.nan
+    
+    binner = FeatureBinner().fit(X)
+    binned = binner.transform(X)
+    missing = np.isnan(X)
+    
+    all_passed = True
+    for j in range(X.shape[1]):
+        missing_codes = np.unique(binned[missing[:, j], j])
+        value_codes = np.unique(binned[~missing[:, j], j])
+        largest_code = binner.transform(np.array([[np.nanmax(X[:, 0]), np.nanmax(X[:, 1])]]))[0, j]
+        separate = (list(missing_codes) == [binner.max_bins - 1]
+                    and binner.max_bins - 1 not in value_codes
+                    and largest_code != binner.max_bins - 1)
+        all_passed = all_passed and separate
+        print(f"{'✅' if separate else '❌'} Feature {j}: {len(value_codes)} value bins, "
+              f"missing bin {missing_codes.tolist()}, largest value bin {largest_code}")
+    
+    return all_passed
+
+
+def main():
+    """Run all pipeline verifications."""
+    tests = [
+        ("Incremental Count Updates", verify_incremental_update),
+        ("Threshold Sweep Cutoffs", verify_cutoff_metrics),
+        ("Feature Binning Missing Values", verify_feature_binning_missing_values),
+    ]
+    
+    results = {}
+    for test_name, test_func in tests:
+        try:
+            results[test_name] = test_func()
+        except Exception as e:
+            print(f"❌ {test_name} failed with error: {e}")
+            results[test_name] = False
+        print()
+    
+    print("📋 VERIFICATION SUMMARY")
+    print("=" * 50)
+    for test_name, passed in results.items():
+        print(f"{'✅ PASS' if passed else '❌ FAIL'} {test_name}")
+    
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -156,6 +156,39 @@ def verify_calculation_consistency():
     
     return consistent_count and consistent_keys and valid_longitudes
 
+def verify_dst_observation_time():
+    """Verify noon Chicago time maps to the right UTC instant on DST transition days."""
+    print("\n🕛 Verifying DST Observation Time")
+    print("=" * 50)
+    
+    calc = AccurateAstronomicalCalculator()
+    
+    # Spring forward (CDT, UTC-5) and fall back (CST, UTC-6) days of 2021
+    expected = {
+        '2021-03-14': pd.Timestamp('2021-03-14 17:00'),
+        '2021-11-07': pd.Timestamp('2021-11-07 18:00'),
+    }
+    dates = pd.DatetimeIndex(list(expected))
+    
+    batch_utc = calc.observation_times_utc(dates)
+    batch_correct = list(batch_utc) == list(expected.values())
+    print(f"✅ Batch noon instants: {batch_correct} ({', '.join(str(t) for t in batch_utc)} UTC)")
+    
+    observer_utc = [pd.Timestamp(calc._create_observer(date).date.datetime()).round('s') for date in dates]
+    observer_correct = observer_utc == list(expected.values())
+    print(f"✅ Observer noon instants: {observer_correct}")
+    
+    # The batch pipeline must reproduce the per-date features on these days
+    batch_df = calc.calculate_features_batch(dates)
+    features_match = all(
+        abs(batch_df[name].iloc[k] - value) < 1e-9
+        for k, date in enumerate(dates)
+        for name, value in calc.calculate_features(date).items()
+    )
+    print(f"✅ Batch features match per-date features: {features_match}")
+    
+    return batch_correct and observer_correct and features_match
+
 def main():
     """Run all verification tests."""
     print("🔍 ASTRONOMICAL CALCULATION VERIFICATION")
@@ -165,7 +198,8 @@ def main():
         ("Date Range", verify_date_range),
         ("Astronomical Accuracy", verify_astronomical_accuracy),
         ("Feature Completeness", verify_feature_completeness),
-        ("Calculation Consistency", verify_calculation_consistency)
+        ("Calculation Consistency", verify_calculation_consistency),
+        ("DST Observation Time", verify_dst_observation_time)
     ]
     
     results = {}
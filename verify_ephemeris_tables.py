@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Chebyshev Ephemeris Table Verification Script
+=============================================
+
+Checks the Chebyshev ephemeris table against PyEphem on every day of its range,
+at the calculator's local observation time and at the next-day instants used for
+daily motion, and reports the maximum error per body.
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from accurate_astronomical_calculator import AccurateAstronomicalCalculator
+from ephemeris_tables import (EPHEMERIS_TABLE_END_YEAR, EPHEMERIS_TABLE_START_YEAR,
+                              EPHEMERIS_TABLE_TOLERANCE_ARCSEC, load_ephemeris_table)
+
+
+def verify_ephemeris_table():
+    """Compare table and PyEphem longitudes for every day of the table range."""
+    print("🪐 Verifying Chebyshev Ephemeris Table")
+    print("=" * 50)
+    
+    calc = AccurateAstronomicalCalculator()
+    table = load_ephemeris_table(calc)
+    
+    dates = pd.date_range(f'{EPHEMERIS_TABLE_START_YEAR}-01-01', f'{EPHEMERIS_TABLE_END_YEAR}-12-31', freq='D')
+    instants = np.unique(np.concatenate([
+        calc._to_ephem_dates(calc.observation_times_utc(dates)),
+        calc._to_ephem_dates(calc.observation_times_utc(dates + pd.Timedelta(days=1))),
+    ]))
+    print(f"Dates: {dates[0].date()} to {dates[-1].date()} ({len(dates)} days, {len(instants)} instants)")
+    
+    start = time.perf_counter()
+    ephem_longitudes = calc._sweep_positions(instants, table.bodies)['longitudes']
+    ephem_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    table_longitudes = table.longitudes(instants)
+    table_seconds = time.perf_counter() - start
+    
+    error = np.abs(table_longitudes - ephem_longitudes)
+    error = np.minimum(error, 360 - error) * 3600  # arcseconds
+    
+    all_passed = True
+    for j, body in enumerate(table.bodies):
+        max_error = error[:, j].max()
+        passed = max_error <= EPHEMERIS_TABLE_TOLERANCE_ARCSEC
+        all_passed = all_passed and passed
+        
+        status = "✅" if passed else "❌"
+        print(f"{status} {body:8s}: max {max_error:.3f}\" mean {error[:, j].mean():.3f}\" "
+              f"(worst at {_instant_label(instants[error[:, j].argmax()])})")
+    
+    print(f"\nTolerance: {EPHEMERIS_TABLE_TOLERANCE_ARCSEC}\"")
+    print(f"PyEphem: {ephem_seconds:.2f}s, table: {table_seconds:.3f}s "
+          f"({ephem_seconds / max(table_seconds, 1e-9):.0f}x faster)")
+    
+    return all_passed
+
+
+def _instant_label(instant):
+    """Format a PyEphem instant as a UTC timestamp."""
+    return (pd.Timestamp('1899-12-31 12:00') + pd.Timedelta(days=float(instant))).strftime('%Y-%m-%d %H:%M UTC')
+
+
+def main():
+    """Run the ephemeris table verification."""
+    passed = verify_ephemeris_table()
+    
+    print("\n" + "=" * 50)
+    if passed:
+        print("🎉 EPHEMERIS TABLE VERIFIED!")
+    else:
+        print("⚠️  EPHEMERIS TABLE EXCEEDS TOLERANCE!")
+    
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)